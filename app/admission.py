@@ -0,0 +1,190 @@
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict, deque
+from typing import Dict, Optional, Tuple
+
+from app.metrics import ADMISSION_REJECTED, route_template
+
+# Priorities, most important first: state-changing requests are admitted before polling reads
+WRITE = 0
+READ = 1
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class Rejected(Exception):
+    def __init__(self, status_code: int, reason: str, retry_after: float):
+        self.status_code = status_code
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class ConcurrencyLimiter:
+    """
+    At most `capacity` requests at a time, with bounded FIFO queues per priority.
+
+    A freed slot goes to the oldest waiting write before any read. Reads may not take
+    the last `write_reserve` slots, so writes still get in while reads saturate the
+    limiter. Waiting longer than `timeout`, or arriving at a full queue, is rejected.
+    Runs on the worker's event loop only, so no locking is needed.
+    """
+
+    def __init__(self, capacity: int, max_queue: int, timeout: float, write_reserve: int = 0):
+        self.capacity = max(1, capacity)
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.write_reserve = min(write_reserve, self.capacity - 1)
+        self.active = 0
+        self._queues: Dict[int, deque] = {WRITE: deque(), READ: deque()}
+
+    def _limit(self, priority: int) -> int:
+        return self.capacity if priority == WRITE else self.capacity - self.write_reserve
+
+    def _has_waiters_ahead(self, priority: int) -> bool:
+        return any(self._queues[p] for p in self._queues if p <= priority)
+
+    async def acquire(self, priority: int) -> None:
+        if self.active < self._limit(priority) and not self._has_waiters_ahead(priority):
+            self.active += 1
+            return
+
+        queue = self._queues[priority]
+        if len(queue) >= self.max_queue:
+            raise Rejected(503, "queue_full", self.timeout)
+
+        waiter = asyncio.get_running_loop().create_future()
+        queue.append(waiter)
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except asyncio.TimeoutError:
+            if waiter.done() and not waiter.cancelled():
+                # Granted a slot at the very moment the wait expired: keep it
+                return
+            queue.remove(waiter)
+            waiter.cancel()
+            raise Rejected(503, "queue_timeout", self.timeout)
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                queue.remove(waiter)
+                waiter.cancel()
+            raise
+
+    def release(self) -> None:
+        self.active -= 1
+        for priority in sorted(self._queues):
+            queue = self._queues[priority]
+            while queue and self.active < self._limit(priority):
+                waiter = queue.popleft()
+                if waiter.done():
+                    continue
+                self.active += 1
+                waiter.set_result(None)
+            if queue:
+                # Lower priorities wait while a higher one is still queued
+                return
+
+
+class TokenBuckets:
+    """Per-client token buckets: `rate` requests/second with bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 100_000):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+
+    def take(self, client: str) -> Optional[float]:
+        """Take one token; returns None if allowed, else seconds until a token is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(client, (float(self.burst), now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[client] = (tokens, now)
+        if len(self._buckets) > self.max_clients:
+            self._buckets.popitem(last=False)
+        return None if allowed else (1 - tokens) / self.rate
+
+
+class AdmissionControlMiddleware:
+    """
+    ASGI middleware that sheds load before it reaches the database pool.
+
+    Each request passes, in order: the client's token bucket (429), its route's own
+    concurrency limiter if one is configured, and the shared limiter sized to the
+    connection pool (503). Rejections are answered immediately with Retry-After.
+    """
+
+    def __init__(
+        self,
+        app,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        write_reserve: int = 0,
+        route_limits: Optional[Dict[str, int]] = None,
+        rate_limit: float = 0.0,
+        rate_burst: int = 1,
+        skip_paths=("/metrics", "/health", "/rooms/events"),
+    ):
+        self.app = app
+        self.limiter = ConcurrencyLimiter(max_concurrency, max_queue, queue_timeout, write_reserve)
+        # "GET /statistics/" -> concurrency limit of that route
+        self.route_limiters = {
+            route: ConcurrencyLimiter(limit, max_queue, queue_timeout)
+            for route, limit in (route_limits or {}).items()
+        }
+        self.buckets = TokenBuckets(rate_limit, rate_burst) if rate_limit > 0 else None
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        priority = READ if method in READ_METHODS else WRITE
+        acquired = []
+        try:
+            if self.buckets is not None:
+                client = scope["client"][0] if scope.get("client") else "unknown"
+                wait = self.buckets.take(client)
+                if wait is not None:
+                    raise Rejected(429, "rate_limited", wait)
+            for limiter in (self.route_limiters.get(f"{method} {route}"), self.limiter):
+                if limiter is not None:
+                    await limiter.acquire(priority)
+                    acquired.append(limiter)
+        except Rejected as rejected:
+            for limiter in acquired:
+                limiter.release()
+            ADMISSION_REJECTED.labels(method, route, rejected.reason).inc()
+            await self._reject(send, rejected)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            for limiter in acquired:
+                limiter.release()
+
+    @staticmethod
+    async def _reject(send, rejected: Rejected) -> None:
+        detail = "Too many requests" if rejected.status_code == 429 else "Server is busy, retry later"
+        body = json.dumps({"detail": detail}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": rejected.status_code,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(max(1, math.ceil(rejected.retry_after))).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,33 @@
+"""
+One-off maintenance commands, run outside the web workers (e.g. by the migrate service):
+
+    python -m app.cli rebuild-counters
+"""
+import argparse
+
+from app.database.database import SessionLocal
+from app.services.hotel_service import HotelService
+
+
+def rebuild_counters() -> None:
+    """Recompute room_counters (STATISTICS_COUNTERS) from the rooms table."""
+    db = SessionLocal()
+    try:
+        HotelService(db).rebuild_room_counters()
+    finally:
+        db.close()
+
+
+COMMANDS = {
+    "rebuild-counters": rebuild_counters,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hotel maintenance commands")
+    parser.add_argument("command", choices=COMMANDS)
+    COMMANDS[parser.parse_args().command]()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
+from typing import Dict, Literal, Optional
 
 
 class Settings(BaseSettings):
@@ -8,6 +9,71 @@ class Settings(BaseSettings):
 
     database_url: str = "postgresql://hotel_user:hotel_pass@db:5432/hotel_db"
 
+    # Read replicas for GET endpoints (JSON list in the environment), used round-robin.
+    # A replica that fails is skipped for db_replica_retry_seconds; reads then go to the primary.
+    database_read_urls: list = []
+    db_replica_retry_seconds: float = 30.0
+
+    # Connection pool. pre-ping: "always" pings on every checkout, "idle" only connections
+    # idle longer than db_pool_pre_ping_idle_seconds, "never" relies on pool_recycle alone.
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: Literal["always", "idle", "never"] = "always"
+    db_pool_pre_ping_idle_seconds: float = 30.0
+    db_pool_warmup: bool = True
+    db_statement_timeout_ms: Optional[int] = None
+    # Connections are pooled by an external pooler (PgBouncer): no in-process pool (NullPool)
+    db_external_pooler: bool = False
+
+    # Async data path: routes await an AsyncSession instead of holding a threadpool worker
+    async_mode: bool = False
+    async_database_url: Optional[str] = None
+
+    # Serve /statistics/ from the room_counters table kept up to date by every write
+    statistics_counters: bool = False
+
+    # In-process room inventory cache (TTL + LRU), invalidated on writes and via LISTEN/NOTIFY
+    room_cache_enabled: bool = True
+    room_cache_size: int = 4096
+    room_cache_ttl: float = 30.0
+
+    # Idempotency-Key results are kept this long (seconds); the most recent ones are also
+    # cached in memory. A duplicate waits up to idempotency_wait_seconds for the original.
+    # A claim whose request never finished (crashed worker) is taken over after
+    # idempotency_lease_seconds; keep it above the longest request.
+    idempotency_ttl: int = 86400
+    idempotency_lease_seconds: int = 60
+    idempotency_cache_size: int = 10000
+    idempotency_wait_seconds: float = 10.0
+
+    # Nights (from today) covered by the in-memory occupancy matrix behind /statistics/occupancy
+    occupancy_horizon_days: int = 366
+
+    # Upper bound (seconds) on how long an ETag stays valid without a local write
+    etag_max_age: int = 300
+
+    # List endpoints build dicts straight from SQL rows and encode them with orjson,
+    # skipping the response_model re-validation
+    fast_responses: bool = False
+
+    # Admission control in front of the pool: at most admission_max_concurrency requests
+    # (default: pool size + overflow) run at once, the rest wait in bounded queues, writes
+    # first; reads can't take the last admission_write_reserve slots. Optional per-route
+    # concurrency limits ({"GET /statistics/": 2}) and per-client rate limit (requests/s, 0 = off).
+    admission_enabled: bool = True
+    admission_max_concurrency: Optional[int] = None
+    admission_max_queue: int = 100
+    admission_queue_timeout: float = 5.0
+    admission_write_reserve: int = 2
+    admission_route_limits: Dict[str, int] = {}
+    admission_rate_limit: float = 0.0
+    admission_rate_burst: int = 20
+
+    # Prometheus /metrics endpoint and per-route request/SQL instrumentation
+    metrics_enabled: bool = True
+
     cors_origins: list = ["*"]
 
     class Config:
@@ -1,24 +1,239 @@
-from sqlalchemy import create_engine
+import itertools
+import logging
+import time
+from typing import List, Optional
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import Engine, make_url
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from app.config import get_settings
+from sqlalchemy.pool import NullPool
+from app.config import Settings, get_settings
 
 settings = get_settings()
 
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    echo=False
-)
+logger = logging.getLogger(__name__)
+
+
+def engine_options(url: str, config: Settings, is_async: bool = False) -> dict:
+    """create_engine keyword arguments for the pool/timeout settings in `config`."""
+    backend = make_url(url).get_backend_name()
+    options = {"echo": False, "pool_pre_ping": config.db_pool_pre_ping == "always"}
+
+    if config.db_external_pooler:
+        options["poolclass"] = NullPool
+        if is_async and backend == "postgresql":
+            # PgBouncer in transaction mode cannot keep asyncpg's prepared statements
+            options["connect_args"] = {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    elif not (backend == "sqlite" and make_url(url).database in (None, "", ":memory:")):
+        options.update(
+            pool_size=config.db_pool_size,
+            max_overflow=config.db_max_overflow,
+            pool_timeout=config.db_pool_timeout,
+            pool_recycle=config.db_pool_recycle,
+        )
+
+    if config.db_statement_timeout_ms and backend == "postgresql":
+        connect_args = options.setdefault("connect_args", {})
+        if is_async:
+            connect_args["server_settings"] = {"statement_timeout": str(config.db_statement_timeout_ms)}
+        else:
+            connect_args["options"] = f"-c statement_timeout={config.db_statement_timeout_ms}"
+
+    return options
+
+
+def enable_idle_pre_ping(engine: Engine, idle_seconds: float) -> None:
+    """Ping only connections that sat idle in the pool for longer than `idle_seconds`."""
+
+    @event.listens_for(engine, "checkin")
+    def remember_checkin(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkout")
+    def ping_if_idle(dbapi_connection, connection_record, connection_proxy):
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < idle_seconds:
+            return
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            # The pool discards this connection and retries the checkout with a fresh one
+            raise exc.DisconnectionError()
+        finally:
+            cursor.close()
+
+
+def create_configured_engine(url: str, config: Settings) -> Engine:
+    engine = create_engine(url, **engine_options(url, config))
+    if config.db_pool_pre_ping == "idle":
+        enable_idle_pre_ping(engine, config.db_pool_pre_ping_idle_seconds)
+    return engine
+
+
+def warm_pool(engine: Engine, connections: int) -> None:
+    """Open `connections` pooled connections up front so first requests skip the connect cost."""
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(engine.connect())
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+engine = create_configured_engine(settings.database_url, settings)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def to_async_url(url: str) -> str:
+    scheme, _, rest = url.partition("://")
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+def get_async_database_url() -> str:
+    return settings.async_database_url or to_async_url(settings.database_url)
+
+
+def create_configured_async_engine(url: str, config: Settings):
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    engine = create_async_engine(url, **engine_options(url, config, is_async=True))
+    if config.db_pool_pre_ping == "idle":
+        enable_idle_pre_ping(engine.sync_engine, config.db_pool_pre_ping_idle_seconds)
+    return engine
+
+
+async_engine = None
+AsyncSessionLocal = None
+
+if settings.async_mode:
+    from sqlalchemy.ext.asyncio import async_sessionmaker
+
+    async_engine = create_configured_async_engine(get_async_database_url(), settings)
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, autoflush=False, expire_on_commit=False
+    )
+
+
+# Connection-level failures that mean "this replica is unusable", as opposed to errors
+# in the query itself. Reads are idempotent, so they are simply repeated on the primary.
+REPLICA_FAILURES = (exc.OperationalError, exc.InterfaceError, exc.TimeoutError)
+
+
+class ReadReplica:
+    """
+    Engines and session factories of one read replica.
+
+    Exposes the same SessionLocal / AsyncSessionLocal attributes as this module,
+    so code that opens sessions can take either as its source. Its sessions carry
+    the replica name in `Session.info["replica"]`.
+    """
+
+    def __init__(self, name: str, url: str, config: Settings):
+        self.name = name
+        self.engine = create_configured_engine(url, config)
+        self.SessionLocal = sessionmaker(
+            autocommit=False, autoflush=False, bind=self.engine, info={"replica": name}
+        )
+        self.async_engine = None
+        self.AsyncSessionLocal = None
+        if config.async_mode:
+            from sqlalchemy.ext.asyncio import async_sessionmaker
+
+            self.async_engine = create_configured_async_engine(to_async_url(url), config)
+            self.AsyncSessionLocal = async_sessionmaker(
+                self.async_engine, autoflush=False, expire_on_commit=False, info={"replica": name}
+            )
+        self.down_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.down_until
+
+    def mark_down(self, retry_seconds: float) -> None:
+        self.down_until = time.monotonic() + retry_seconds
+
+
+class ReadReplicaSet:
+    """Round-robin choice among healthy replicas; None means "read from the primary"."""
+
+    def __init__(self, replicas: List[ReadReplica], retry_seconds: float):
+        self.replicas = replicas
+        self.retry_seconds = retry_seconds
+        self._turn = itertools.count()
+
+    def choose(self) -> Optional[ReadReplica]:
+        if not self.replicas:
+            return None
+        start = next(self._turn)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.healthy:
+                return replica
+        return None
+
+    def mark_down(self, replica: ReadReplica) -> None:
+        replica.mark_down(self.retry_seconds)
+
+
+read_replicas = ReadReplicaSet(
+    [ReadReplica(f"replica{index}", url, settings) for index, url in enumerate(settings.database_read_urls)],
+    settings.db_replica_retry_seconds,
+)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+def open_read_session():
+    """
+    Sync session on a healthy read replica, or on the primary when there is none.
+
+    The replica connection is opened up front: a replica that is down is marked so and
+    the primary is used instead, since a failure later (e.g. mid-stream) can't be retried.
+    """
+    replica = read_replicas.choose()
+    if replica is not None:
+        db = replica.SessionLocal()
+        try:
+            db.connection()
+            return db
+        except REPLICA_FAILURES:
+            logger.warning("Read replica %s failed, falling back to the primary", replica.name, exc_info=True)
+            db.close()
+            read_replicas.mark_down(replica)
+    return SessionLocal()
+
+
+def get_read_db():
+    db = open_read_session()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def warm_async_pool(connections: int) -> None:
+    opened = []
+    try:
+        for _ in range(connections):
+            opened.append(await async_engine.connect())
+    finally:
+        for conn in opened:
+            await conn.close()
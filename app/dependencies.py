@@ -1,19 +1,96 @@
-from typing import Generator
-from sqlalchemy.orm import Session
-from app.database.database import get_db
-from app.services.hotel_service import HotelService
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Optional, Union
+from fastapi import Header, HTTPException, Request, Response, status
+from starlette.concurrency import run_in_threadpool
 
+from app.config import get_settings
+from app.database import database
+from app.services.async_hotel_service import AsyncHotelService, ThreadedHotelService, ReplicaHotelService
+from app.services.cache import data_version
+from app.services.idempotency import IdempotencyGuard, IDEMPOTENCY_HEADER, request_fingerprint
 
-def get_hotel_service(db: Session = None) -> Generator[HotelService, None, None]:
-    if db is None:
-        db_gen = get_db()
-        db = next(db_gen)
+settings = get_settings()
+
+
+@asynccontextmanager
+async def open_hotel_service(source=database) -> AsyncIterator[Union[AsyncHotelService, ThreadedHotelService]]:
+    """Service on a session from `source`: the database module (primary) or a ReadReplica."""
+    if settings.async_mode:
+        async with source.AsyncSessionLocal() as db:
+            yield AsyncHotelService(db)
+    else:
+        db = source.SessionLocal()
         try:
-            yield HotelService(db)
+            yield ThreadedHotelService(db)
         finally:
-            try:
-                next(db_gen)
-            except StopIteration:
-                pass
-    else:
-        yield HotelService(db)
+            await run_in_threadpool(db.close)
+
+
+async def get_hotel_service() -> AsyncGenerator[Union[AsyncHotelService, ThreadedHotelService], None]:
+    async with open_hotel_service() as service:
+        yield service
+
+
+async def get_read_hotel_service(response: Response) -> AsyncGenerator[
+    Union[AsyncHotelService, ThreadedHotelService, ReplicaHotelService], None
+]:
+    """
+    Service for read-only endpoints: a healthy read replica if configured, else the primary.
+
+    Writes (and the responses they return) always use get_hotel_service, so a client
+    reads its own writes from the primary. Replica responses carry no ETag: the local
+    data version may already count writes the replica has not replayed yet.
+    """
+    replica = database.read_replicas.choose()
+    if replica is None:
+        async with open_hotel_service() as service:
+            yield service
+        return
+
+    if "etag" in response.headers:
+        del response.headers["etag"]
+
+    async with AsyncExitStack() as stack:
+        service = await stack.enter_async_context(open_hotel_service(replica))
+        yield ReplicaHotelService(
+            service,
+            on_failure=lambda: database.read_replicas.mark_down(replica),
+            open_primary=lambda: stack.enter_async_context(open_hotel_service()),
+        )
+
+
+def conditional_get(request: Request, response: Response) -> None:
+    """
+    ETag / If-None-Match support for polled read endpoints.
+
+    The ETag is derived from the in-process data version and the query string, so a
+    matching If-None-Match is answered with 304 before any database work or serialization.
+    """
+    etag = data_version.etag(request.url.query)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        if "*" in candidates or etag.removeprefix("W/") in candidates:
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Cache-Control": "no-cache"}
+            )
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+
+
+async def idempotency_guard(
+    request: Request,
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias=IDEMPOTENCY_HEADER,
+        max_length=255,
+        description="Client-generated key; a retry with the same key replays the original response"
+    )
+) -> IdempotencyGuard:
+    route = request.scope.get("route")
+    return IdempotencyGuard(
+        idempotency_key,
+        request_fingerprint(request.method, request.url.path, await request.body()),
+        getattr(route, "status_code", None) or status.HTTP_200_OK
+    )
@@ -1,27 +1,112 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from starlette.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
-from app.database.database import engine, Base
+from app.database import database
+from app.database.database import engine, SessionLocal, warm_pool, warm_async_pool
 from app.routers import rooms, bookings, rentals, statistics
+from app.services.pagination import NEXT_CURSOR_HEADER
+from app.services.cache import data_version, rooms_changed
+from app.services.notifications import PgListener, ROOMS_CHANNEL, current_data_version
+from app.services.events import room_events
+from app.services.idempotency import idempotency, REPLAYED_HEADER
+from app.services.occupancy import occupancy_calendar, StayChange
+from app.metrics import MetricsMiddleware, instrument_engine, metrics_endpoint
+from app.admission import AdmissionControlMiddleware
 
 settings = get_settings()
 
-Base.metadata.create_all(bind=engine)
+# Importing the app must not touch the database: engines connect lazily, the schema is
+# managed by migrations (`alembic upgrade head`), and everything that needs a connection
+# runs in the lifespan below.
+
+
+def on_rooms_notification(payload: dict) -> None:
+    # Another worker committed room changes: same bookkeeping as a local commit
+    rooms_changed(payload.get("version"))
+    rooms = payload.get("rooms")
+    if rooms != []:
+        room_events.publish(rooms)
+    stays = payload.get("stays")
+    if stays is None or rooms is None or any(room["previous_status"] is None for room in rooms):
+        occupancy_calendar.invalidate()
+    if stays:
+        occupancy_calendar.apply(StayChange.from_payload(stay) for stay in stays)
+
+
+pg_listener = PgListener(engine)
+pg_listener.subscribe(ROOMS_CHANNEL, on_rooms_notification)
+
+
+def load_data_version() -> None:
+    # Start from the shared version, so a fresh worker issues the same ETags as the others
+    db = SessionLocal()
+    try:
+        version = current_data_version(db)
+    finally:
+        db.close()
+    if version is not None:
+        data_version.bump(version)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.db_pool_warmup and not settings.db_external_pooler:
+        await run_in_threadpool(warm_pool, engine, settings.db_pool_size)
+        if database.async_engine is not None:
+            await warm_async_pool(settings.db_pool_size)
+    room_events.start(asyncio.get_running_loop())
+    pg_listener.start()
+    await run_in_threadpool(load_data_version)
+    purge_task = asyncio.create_task(idempotency.purge_forever())
+    yield
+    purge_task.cancel()
+    pg_listener.stop()
+    room_events.stop()
+
 
 app = FastAPI(
     title="Hotel Management System",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
+if settings.admission_enabled:
+    # Innermost of the middlewares: rejections still get CORS headers and are counted in metrics
+    app.add_middleware(
+        AdmissionControlMiddleware,
+        max_concurrency=settings.admission_max_concurrency or settings.db_pool_size + settings.db_max_overflow,
+        max_queue=settings.admission_max_queue,
+        queue_timeout=settings.admission_queue_timeout,
+        write_reserve=settings.admission_write_reserve,
+        route_limits=settings.admission_route_limits,
+        rate_limit=settings.admission_rate_limit,
+        rate_burst=settings.admission_rate_burst,
+    )
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", REPLAYED_HEADER],
 )
 
+if settings.metrics_enabled:
+    instrument_engine(engine)
+    if database.async_engine is not None:
+        instrument_engine(database.async_engine.sync_engine, name="async")
+    for replica in database.read_replicas.replicas:
+        instrument_engine(replica.engine, name=replica.name)
+        if replica.async_engine is not None:
+            instrument_engine(replica.async_engine.sync_engine, name=f"{replica.name}_async")
+    app.add_middleware(MetricsMiddleware)
+    app.add_route("/metrics", metrics_endpoint, include_in_schema=False)
+
 app.include_router(rooms.router)
 app.include_router(bookings.router)
 app.include_router(rentals.router)
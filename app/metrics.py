@@ -0,0 +1,167 @@
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.routing import Match
+
+REQUEST_COUNT = Counter(
+    "http_requests_total", "HTTP requests by route and status code",
+    ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route",
+    ["method", "route"]
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress", "HTTP requests currently being served",
+    ["method", "route"]
+)
+REQUEST_SQL_STATEMENTS = Histogram(
+    "http_request_sql_statements", "SQL statements executed per request",
+    ["method", "route"], buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100, 500)
+)
+REQUEST_SQL_DURATION = Histogram(
+    "http_request_sql_duration_seconds", "Total SQL execution time per request",
+    ["method", "route"]
+)
+ADMISSION_REJECTED = Counter(
+    "http_requests_rejected_total", "Requests shed by admission control, by reason",
+    ["method", "route", "reason"]
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds", "Time spent waiting for a pooled connection",
+    ["engine"], buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+# [statement count, seconds] of the request being served; shared by reference with
+# threadpool workers and run_sync greenlets, which run in a copy of the context.
+_request_sql: ContextVar[Optional[list]] = ContextVar("request_sql", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is discarded with a failed statement too
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    sql = _request_sql.get()
+    if sql is not None and started is not None:
+        sql[0] += 1
+        sql[1] += time.perf_counter() - started
+
+
+class PoolCollector:
+    """Reads connection pool gauges at scrape time."""
+
+    def __init__(self):
+        self.engines = {}
+
+    def add(self, name: str, engine: Engine) -> None:
+        self.engines[name] = engine
+
+    def collect(self):
+        checked_out = GaugeMetricFamily("db_pool_checked_out", "Connections checked out of the pool", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Connections open beyond pool_size", labels=["engine"])
+        size = GaugeMetricFamily("db_pool_size", "Configured pool size", labels=["engine"])
+        for name, engine in self.engines.items():
+            pool = engine.pool
+            # NullPool / StaticPool have no sizing counters
+            if hasattr(pool, "checkedout"):
+                checked_out.add_metric([name], pool.checkedout())
+                overflow.add_metric([name], max(pool.overflow(), 0))
+                size.add_metric([name], pool.size())
+        yield checked_out
+        yield overflow
+        yield size
+
+
+pool_collector = PoolCollector()
+REGISTRY.register(pool_collector)
+
+
+def instrument_engine(engine: Engine, name: str = "primary") -> None:
+    """Attach per-request SQL accounting and pool metrics to an engine."""
+    if name in pool_collector.engines:
+        return
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    pool_collector.add(name, engine)
+    _time_pool_checkout(engine, name)
+
+
+def _time_pool_checkout(engine: Engine, name: str) -> None:
+    # There is no "before checkout" pool event, so the pool's connect() is wrapped to
+    # time how long callers block waiting for a connection.
+    pool = engine.pool
+    connect = pool.connect
+    histogram = POOL_CHECKOUT_WAIT.labels(name)
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            histogram.observe(time.perf_counter() - started)
+
+    pool.connect = timed_connect
+
+
+def route_template(scope) -> str:
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status, in-flight count and SQL usage per route."""
+
+    def __init__(self, app, skip_paths=("/metrics",)):
+        self.app = app
+        self.skip_paths = set(skip_paths)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] in self.skip_paths:
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status_code = 500
+        sql = [0, 0.0]
+        token = _request_sql.set(sql)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_LATENCY.labels(method, route).observe(time.perf_counter() - started)
+            REQUEST_COUNT.labels(method, route, str(status_code)).inc()
+            REQUEST_SQL_STATEMENTS.labels(method, route).observe(sql[0])
+            REQUEST_SQL_DURATION.labels(method, route).observe(sql[1])
+            in_progress.dec()
+            _request_sql.reset(token)
+
+
+def metrics_endpoint(request: Request) -> Response:
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -22,3 +22,32 @@ class RoomCategory(str, Enum):
             self.PRESIDENT: 2000.0
         }
         return prices[self]
+
+
+class ExportFormat(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+    @property
+    def media_type(self) -> str:
+        media_types = {
+            self.NDJSON: "application/x-ndjson",
+            self.CSV: "text/csv",
+        }
+        return media_types[self]
+
+
+class ReservationKind(str, Enum):
+    BOOKING = "booking"
+    RENTAL = "rental"
+
+
+# Lifecycle of a live reservation: booked -> rented at check-in; completion archives it
+class ReservationState(str, Enum):
+    BOOKED = "booked"
+    RENTED = "rented"
+
+
+class ReservationOutcome(str, Enum):
+    COMPLETED = "completed"
+    CANCELLED = "cancelled"
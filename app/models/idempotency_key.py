@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime
+from app.database.database import Base
+
+
+class IdempotencyKey(Base):
+    """
+    Result of a request sent with an Idempotency-Key header.
+
+    A row without status_code is a claim: the first request with this key is still running.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<IdempotencyKey(key={self.key}, status_code={self.status_code})>"
@@ -0,0 +1,41 @@
+from sqlalchemy import Column, Integer, String, Date, Enum as SQLEnum, ForeignKey, Index, text
+from app.database.database import Base
+from app.models.enums import ReservationState
+
+
+class Reservation(Base):
+    """
+    One row per live stay; `state` is its lifecycle position and the polymorphic
+    discriminator. Booking and Rental are single-table views over the booked and
+    rented rows, so check-in is an UPDATE of `state` rather than a delete + insert.
+    """
+    __tablename__ = "reservations"
+    __table_args__ = (
+        # Per-room overlap probes: room_id = ? AND start_date < :end AND end_date > :start
+        Index("ix_reservations_room_dates", "room_id", "start_date", "end_date"),
+        # Postgres: GiST over the stay range for "&&" interval-overlap searches
+        Index(
+            "ix_reservations_stay_gist",
+            text("daterange(start_date, end_date)"),
+            postgresql_using="gist",
+        ).ddl_if(dialect="postgresql"),
+        # Ids are never handed out again (SQLite would reuse a deleted max id), so an
+        # archived (kind, reservation_id) in reservation_history stays unique
+        {"sqlite_autoincrement": True},
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False)
+    state = Column(SQLEnum(ReservationState), nullable=False)
+    guest_name = Column(String(255), nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+
+    __mapper_args__ = {"polymorphic_on": state}
+
+    @property
+    def duration_days(self) -> int:
+        return (self.end_date - self.start_date).days
+
+    def __repr__(self):
+        return f"<{type(self).__name__}(id={self.id}, room_id={self.room_id}, guest={self.guest_name})>"
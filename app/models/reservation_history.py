@@ -0,0 +1,53 @@
+from datetime import datetime, timezone
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, Enum as SQLEnum, DDL, event
+from app.database.database import Base
+from app.models.enums import RoomCategory, ReservationKind, ReservationOutcome
+
+
+class ReservationHistory(Base):
+    """
+    Append-only archive of finished reservations (completed rentals, cancelled bookings).
+
+    On Postgres the table is partitioned by RANGE(end_date), so old periods can be
+    detached or dropped without touching live data; the partition key is part of the key.
+    """
+    __tablename__ = "reservation_history"
+    __table_args__ = {"postgresql_partition_by": "RANGE (end_date)"}
+
+    kind = Column(SQLEnum(ReservationKind), primary_key=True)
+    reservation_id = Column(Integer, primary_key=True, autoincrement=False)
+    end_date = Column(Date, primary_key=True)
+    start_date = Column(Date, nullable=False)
+    outcome = Column(SQLEnum(ReservationOutcome), nullable=False)
+    room_number = Column(Integer, nullable=False)
+    category = Column(SQLEnum(RoomCategory), nullable=False)
+    guest_name = Column(String(255), nullable=False)
+    total_cost = Column(Float, nullable=False, default=0.0)
+    archived_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    def __repr__(self):
+        return (f"<ReservationHistory(kind={self.kind.value}, id={self.reservation_id}, "
+                f"outcome={self.outcome.value})>")
+
+
+# Migration 0002 creates the yearly partitions; a table made by Base.metadata.create_all
+# (tests, benchmarks) gets only a default partition so that inserts still have a home.
+event.listen(
+    ReservationHistory.__table__,
+    "after_create",
+    DDL("CREATE TABLE reservation_history_default PARTITION OF reservation_history DEFAULT")
+    .execute_if(dialect="postgresql"),
+)
+
+
+class DailyRevenue(Base):
+    """Revenue and occupied room-nights per (night, category), rolled up as rentals complete."""
+    __tablename__ = "daily_revenue"
+
+    day = Column(Date, primary_key=True)
+    category = Column(SQLEnum(RoomCategory), primary_key=True)
+    revenue = Column(Float, nullable=False, default=0.0)
+    room_nights = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<DailyRevenue(day={self.day}, category={self.category.value}, revenue={self.revenue})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Enum as SQLEnum, ForeignKey
+from sqlalchemy import Column, Integer, String, Enum as SQLEnum, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from app.database.database import Base
 from app.models.enums import RoomStatus, RoomCategory
@@ -6,6 +6,21 @@ from app.models.enums import RoomStatus, RoomCategory
 
 class Room(Base):
     __tablename__ = "rooms"
+    __table_args__ = (
+        # Listings by category and/or status in number order (keyset pages), and the
+        # per-(category, status) counts of /statistics/ as an index-only scan
+        Index("ix_rooms_category_status_number", "category", "status", "number"),
+        # Auto-assign walks one category in id order and stops at the first free room
+        Index("ix_rooms_category_id", "category", "id"),
+        # /rooms/free: only the free rooms, by category in number order (enums are stored by name)
+        Index(
+            "ix_rooms_free_category_number",
+            "category",
+            "number",
+            postgresql_where=text("status = 'FREE'"),
+            sqlite_where=text("status = 'FREE'"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     number = Column(Integer, unique=True, nullable=False, index=True)
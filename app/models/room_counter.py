@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, Enum as SQLEnum
+from app.database.database import Base
+from app.models.enums import RoomStatus, RoomCategory
+
+
+class RoomCounter(Base):
+    """Number of rooms per (category, status), maintained by HotelService writes."""
+    __tablename__ = "room_counters"
+
+    category = Column(SQLEnum(RoomCategory), primary_key=True)
+    status = Column(SQLEnum(RoomStatus), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<RoomCounter(category={self.category.value}, status={self.status.value}, count={self.count})>"
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, field_validator, Field
 from datetime import date
-from typing import Optional
+from typing import Dict, List, Optional
 from app.models.enums import RoomStatus, RoomCategory
 
 
@@ -13,6 +13,19 @@ class RoomCreate(RoomBase):
     pass
 
 
+class RoomBulkItemResult(BaseModel):
+    number: int
+    created: bool
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class RoomBulkResponse(BaseModel):
+    created: int
+    duplicates: List[int]
+    results: List[RoomBulkItemResult]
+
+
 class RoomUpdate(BaseModel):
     category: Optional[RoomCategory] = None
     status: Optional[RoomStatus] = None
@@ -27,8 +40,8 @@ class RoomResponse(RoomBase):
         from_attributes = True
 
 
-class BookingBase(BaseModel):
-    room_number: int = Field(..., gt=0, description="Room number to book")
+class StayBase(BaseModel):
+    """Guest and dates shared by every booking and rental request."""
     guest_name: str = Field(..., min_length=1, max_length=255, description="Guest name")
     start_date: date
     end_date: date
@@ -55,6 +68,10 @@ class BookingBase(BaseModel):
         return v
 
 
+class BookingBase(StayBase):
+    room_number: int = Field(..., gt=0, description="Room number to book")
+
+
 class BookingCreate(BookingBase):
     pass
 
@@ -73,32 +90,45 @@ class BookingResponse(BaseModel):
         from_attributes = True
 
 
-class RentalBase(BaseModel):
-    room_number: int = Field(..., gt=0, description="Room number to rent")
-    guest_name: str = Field(..., min_length=1, max_length=255, description="Guest name")
-    start_date: date
-    end_date: date
+class GroupBookingCreate(StayBase):
+    room_numbers: List[int] = Field(..., min_length=1, max_length=200, description="Room numbers to book")
+    guest_name: str = Field(..., min_length=1, max_length=255, description="Guest party name")
 
-    @field_validator('guest_name')
+    @field_validator('room_numbers')
     @classmethod
-    def validate_guest_name(cls, v: str) -> str:
-        if not v.strip():
-            raise ValueError("Guest name cannot be empty")
-        return v.strip()
-
-    @field_validator('end_date')
-    @classmethod
-    def validate_dates(cls, v: date, info) -> date:
-        if 'start_date' in info.data and v <= info.data['start_date']:
-            raise ValueError("End date must be after start date")
+    def validate_room_numbers(cls, v: List[int]) -> List[int]:
+        if any(number <= 0 for number in v):
+            raise ValueError("Room numbers must be positive")
+        if len(set(v)) != len(v):
+            raise ValueError("Room numbers must be unique")
         return v
 
-    @field_validator('start_date')
-    @classmethod
-    def validate_start_date_not_past(cls, v: date) -> date:
-        if v < date.today():
-            raise ValueError("Start date cannot be in the past")
-        return v
+
+class AutoReservationBase(StayBase):
+    category: RoomCategory
+
+
+class AutoBookingCreate(AutoReservationBase):
+    pass
+
+
+class AutoRentalCreate(AutoReservationBase):
+    pass
+
+
+class GroupBookingResponse(BaseModel):
+    guest_name: str
+    bookings: List[BookingResponse]
+    total_estimated_cost: float
+
+
+class RoomConflict(BaseModel):
+    room_number: int
+    reason: str
+
+
+class RentalBase(StayBase):
+    room_number: int = Field(..., gt=0, description="Room number to rent")
 
 
 class RentalCreate(RentalBase):
@@ -126,12 +156,72 @@ class RentalCompleteResponse(BaseModel):
     total_cost: float
 
 
+class CategoryStatistics(BaseModel):
+    total_rooms: int
+    free_rooms: int
+    booked_rooms: int
+    rented_rooms: int
+
+
 class StatisticsResponse(BaseModel):
     total_rooms: int
     free_rooms: int
     booked_rooms: int
     rented_rooms: int
     occupancy_rate: float
+    by_category: Dict[RoomCategory, CategoryStatistics]
+
+
+class RevenueTotals(BaseModel):
+    revenue: float
+    room_nights: int
+
+
+class DailyRevenueItem(BaseModel):
+    day: date
+    revenue: float
+    room_nights: int
+
+
+class RevenueStatisticsResponse(BaseModel):
+    date_from: date
+    date_to: date
+    revenue: float
+    room_nights: int
+    by_category: Dict[RoomCategory, RevenueTotals]
+    daily: List[DailyRevenueItem]
+
+
+class OccupancyTotals(BaseModel):
+    rooms: int
+    room_nights: int
+    booked_room_nights: int
+    rented_room_nights: int
+    occupancy_rate: float
+
+
+class OccupancyDay(BaseModel):
+    day: date
+    booked: int
+    rented: int
+    occupancy_rate: float
+
+
+class OccupancyResponse(OccupancyTotals):
+    date_from: date
+    date_to: date
+    category: Optional[RoomCategory] = None
+    by_category: Dict[RoomCategory, OccupancyTotals]
+    daily: List[OccupancyDay]
+
+
+class CacheStatsResponse(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    invalidations: int
 
 
 class ErrorResponse(BaseModel):
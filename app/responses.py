@@ -0,0 +1,25 @@
+from typing import Any, List, Optional
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+
+from app.config import get_settings
+from app.services.pagination import set_next_cursor
+
+settings = get_settings()
+
+
+def list_response(response: Response, items: List[Any], key: str, limit: Optional[int] = None):
+    """
+    Return a list endpoint's items, with the keyset cursor header for paginated calls.
+
+    In fast mode the items are plain dicts already shaped like the response model:
+    they are encoded with orjson and returned as a Response, so FastAPI skips the
+    second validation pass through response_model. The OpenAPI schema is unchanged.
+    """
+    set_next_cursor(response, items, key, limit)
+    if not settings.fast_responses:
+        return items
+
+    # carry over headers set by dependencies (ETag, cursor); FastAPI strips content-length
+    return ORJSONResponse(items, headers=dict(response.headers))
@@ -1,18 +1,30 @@
-from fastapi import APIRouter, Depends, status
-from typing import List
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from sqlalchemy.orm import Session
 
-from app.database.database import get_db
+from app.database.database import get_read_db
+from app.dependencies import get_hotel_service, get_read_hotel_service, idempotency_guard
+from app.services.idempotency import IdempotencyGuard
 from app.services.hotel_service import HotelService
-from app.models.schemas import BookingCreate, BookingResponse
+from app.services.pagination import MAX_PAGE_SIZE
+from app.responses import list_response
+from app.config import get_settings
+from app.models.enums import ExportFormat
+from app.models.schemas import (
+    BookingCreate, BookingResponse, AutoBookingCreate, GroupBookingCreate, GroupBookingResponse, RentalResponse
+)
+
+settings = get_settings()
 
 router = APIRouter(prefix="/bookings", tags=["Bookings"])
 
 
 @router.post("/", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
-def create_booking(
+async def create_booking(
     booking_data: BookingCreate,
-    db: Session = Depends(get_db)
+    idempotency: IdempotencyGuard = Depends(idempotency_guard),
+    service=Depends(get_hotel_service)
 ):
     """
     Create a new booking.
@@ -21,25 +33,106 @@ def create_booking(
     - **start_date**: Check-in date (cannot be in the past)
     - **end_date**: Check-out date (must be after start_date)
     """
-    service = HotelService(db)
-    return service.create_booking(booking_data)
+    return await idempotency.run(service.create_booking, booking_data)
+
+
+@router.post("/group", response_model=GroupBookingResponse, status_code=status.HTTP_201_CREATED)
+async def create_group_booking(
+    group_data: GroupBookingCreate,
+    idempotency: IdempotencyGuard = Depends(idempotency_guard),
+    service=Depends(get_hotel_service)
+):
+    """
+    Book several rooms for one guest party in a single transaction.
+    - **room_numbers**: Room numbers to book (up to 200)
+    - **guest_name**: Guest party name
+    - **start_date**: Check-in date (cannot be in the past)
+    - **end_date**: Check-out date (must be after start_date)
+
+    All-or-nothing: if any room is missing or unavailable, nothing is booked and
+    a 409 response lists the conflicting rooms.
+    """
+    return await idempotency.run(service.create_group_booking, group_data)
+
+
+@router.post("/auto", response_model=BookingResponse, status_code=status.HTTP_201_CREATED)
+async def create_auto_booking(
+    booking_data: AutoBookingCreate,
+    idempotency: IdempotencyGuard = Depends(idempotency_guard),
+    service=Depends(get_hotel_service)
+):
+    """
+    Book any room of the requested category that is free for the whole stay.
+    - **category**: Room category (стандарт, комфорт, люкс, президентський)
+    - **guest_name**: Guest name
+    - **start_date**: Check-in date (cannot be in the past)
+    - **end_date**: Check-out date (must be after start_date)
+
+    Concurrent requests are spread across free rooms (FOR UPDATE SKIP LOCKED)
+    instead of contending for one room; 409 if no room of the category is free.
+    """
+    return await idempotency.run(service.create_auto_booking, booking_data)
 
 
 @router.get("/", response_model=List[BookingResponse])
-def get_all_bookings(db: Session = Depends(get_db)):
-    """Get all active bookings."""
+async def get_all_bookings(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service=Depends(get_read_hotel_service)
+):
+    """
+    Get all active bookings.
+    - **limit**: Page size (opt-in keyset pagination)
+    - **cursor**: Value of the `X-Next-Cursor` header from the previous page
+    """
+    items = await service.get_all_bookings(limit=limit, cursor=cursor, raw=settings.fast_responses)
+    return list_response(response, items, "id", limit)
+
+
+@router.get("/export")
+def export_bookings(
+    format: ExportFormat = ExportFormat.NDJSON,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Stream all active bookings as NDJSON or CSV.
+    - **format**: ndjson (default) or csv
+
+    Rows are read from a server-side cursor in batches, so memory stays flat
+    regardless of the number of bookings.
+    """
     service = HotelService(db)
-    return service.get_all_bookings()
+    return StreamingResponse(
+        service.export_bookings(format),
+        media_type=format.media_type,
+        headers={"Content-Disposition": f"attachment; filename=bookings.{format.value}"}
+    )
+
+
+@router.post("/{booking_id}/check-in", response_model=RentalResponse, status_code=status.HTTP_200_OK)
+async def check_in_booking(
+    booking_id: int,
+    idempotency: IdempotencyGuard = Depends(idempotency_guard),
+    service=Depends(get_hotel_service)
+):
+    """
+    Check the guest of a booking in: the booking becomes a rental with the same ID.
+    - **booking_id**: ID of the booking to check in
+
+    A single transaction updates the reservation state and the room status, so the
+    room is never seen as free in between; 409 if the booking is already checked in.
+    """
+    return await idempotency.run(service.check_in_booking, booking_id)
 
 
 @router.delete("/{booking_id}", status_code=status.HTTP_200_OK)
-def delete_booking(
+async def delete_booking(
     booking_id: int,
-    db: Session = Depends(get_db)
+    service=Depends(get_hotel_service)
 ):
     """
     Delete a booking by ID.
     - **booking_id**: ID of the booking to delete
     """
-    service = HotelService(db)
-    return service.delete_booking(booking_id)
+    return await service.delete_booking(booking_id)
@@ -1,18 +1,28 @@
-from fastapi import APIRouter, Depends, status
-from typing import List
+from fastapi import APIRouter, Depends, Query, Response, status
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from sqlalchemy.orm import Session
 
-from app.database.database import get_db
+from app.database.database import get_read_db
+from app.dependencies import get_hotel_service, get_read_hotel_service, idempotency_guard
+from app.services.idempotency import IdempotencyGuard
 from app.services.hotel_service import HotelService
-from app.models.schemas import RentalCreate, RentalResponse
+from app.services.pagination import MAX_PAGE_SIZE
+from app.responses import list_response
+from app.config import get_settings
+from app.models.enums import ExportFormat
+from app.models.schemas import RentalCreate, RentalResponse, AutoRentalCreate
+
+settings = get_settings()
 
 router = APIRouter(prefix="/rentals", tags=["Rentals"])
 
 
 @router.post("/", response_model=RentalResponse, status_code=status.HTTP_201_CREATED)
-def create_rental(
+async def create_rental(
     rental_data: RentalCreate,
-    db: Session = Depends(get_db)
+    idempotency: IdempotencyGuard = Depends(idempotency_guard),
+    service=Depends(get_hotel_service)
 ):
     """
     Create a new rental (rent out a room to a guest).
@@ -21,25 +31,71 @@ def create_rental(
     - **start_date**: Check-in date (cannot be in the past)
     - **end_date**: Check-out date (must be after start_date)
     """
-    service = HotelService(db)
-    return service.create_rental(rental_data)
+    return await idempotency.run(service.create_rental, rental_data)
+
+
+@router.post("/auto", response_model=RentalResponse, status_code=status.HTTP_201_CREATED)
+async def create_auto_rental(
+    rental_data: AutoRentalCreate,
+    idempotency: IdempotencyGuard = Depends(idempotency_guard),
+    service=Depends(get_hotel_service)
+):
+    """
+    Rent out any room of the requested category that is free for the whole stay.
+    - **category**: Room category (стандарт, комфорт, люкс, президентський)
+    - **guest_name**: Guest name
+    - **start_date**: Check-in date (cannot be in the past)
+    - **end_date**: Check-out date (must be after start_date)
+
+    Concurrent requests are spread across free rooms (FOR UPDATE SKIP LOCKED)
+    instead of contending for one room; 409 if no room of the category is free.
+    """
+    return await idempotency.run(service.create_auto_rental, rental_data)
 
 
 @router.get("/", response_model=List[RentalResponse])
-def get_all_rentals(db: Session = Depends(get_db)):
-    """Get all active rentals."""
+async def get_all_rentals(
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service=Depends(get_read_hotel_service)
+):
+    """
+    Get all active rentals.
+    - **limit**: Page size (opt-in keyset pagination)
+    - **cursor**: Value of the `X-Next-Cursor` header from the previous page
+    """
+    items = await service.get_all_rentals(limit=limit, cursor=cursor, raw=settings.fast_responses)
+    return list_response(response, items, "id", limit)
+
+
+@router.get("/export")
+def export_rentals(
+    format: ExportFormat = ExportFormat.NDJSON,
+    db: Session = Depends(get_read_db)
+):
+    """
+    Stream all active rentals as NDJSON or CSV.
+    - **format**: ndjson (default) or csv
+
+    Rows are read from a server-side cursor in batches, so memory stays flat
+    regardless of the number of rentals.
+    """
     service = HotelService(db)
-    return service.get_all_rentals()
+    return StreamingResponse(
+        service.export_rentals(format),
+        media_type=format.media_type,
+        headers={"Content-Disposition": f"attachment; filename=rentals.{format.value}"}
+    )
 
 
 @router.put("/{rental_id}/complete", status_code=status.HTTP_200_OK)
-def complete_rental(
+async def complete_rental(
     rental_id: int,
-    db: Session = Depends(get_db)
+    service=Depends(get_hotel_service)
 ):
     """
     Complete a rental by ID.
     - **rental_id**: ID of the rental to complete
     """
-    service = HotelService(db)
-    return service.complete_rental(rental_id)
+    return await service.complete_rental(rental_id)
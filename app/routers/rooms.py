@@ -1,67 +1,128 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from datetime import date
 
-from app.database.database import get_db
-from app.services.hotel_service import HotelService
-from app.models.schemas import RoomCreate, RoomResponse
+from app.dependencies import get_hotel_service, get_read_hotel_service, conditional_get
+from app.services.pagination import MAX_PAGE_SIZE
+from app.responses import list_response
+from app.services.events import room_event_stream
+from app.config import get_settings
+from app.models.schemas import RoomCreate, RoomResponse, RoomBulkResponse
 from app.models.enums import RoomCategory, RoomStatus
 
+settings = get_settings()
+
 router = APIRouter(prefix="/rooms", tags=["Rooms"])
 
+MAX_BULK_ROOMS = 10000
+
 
 @router.post("/", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
-def create_room(
+async def create_room(
     room_data: RoomCreate,
-    db: Session = Depends(get_db)
+    service=Depends(get_hotel_service)
 ):
     """Create a new room."""
-    service = HotelService(db)
-    return service.create_room(room_data)
+    return await service.create_room(room_data)
+
+
+@router.post("/bulk", response_model=RoomBulkResponse)
+async def create_rooms_bulk(
+    rooms_data: List[RoomCreate] = Body(..., max_length=MAX_BULK_ROOMS),
+    service=Depends(get_hotel_service)
+):
+    """
+    Create many rooms in one transaction.
+
+    Room numbers that already exist (or repeat within the request) are reported
+    per item as duplicates instead of failing the whole batch.
+    """
+    return await service.create_rooms_bulk(rooms_data)
 
 
-@router.get("/", response_model=List[RoomResponse])
-def get_all_rooms(
+@router.get("/", response_model=List[RoomResponse], dependencies=[Depends(conditional_get)])
+async def get_all_rooms(
+    response: Response,
     category: Optional[RoomCategory] = None,
     status_filter: Optional[RoomStatus] = None,
-    db: Session = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    service=Depends(get_read_hotel_service)
 ):
     """
     Get all rooms with optional filters.
     - **category**: Filter by room category (стандарт, комфорт, люкс, президентський)
     - **status_filter**: Filter by room status (вільний, заброньований, зданий)
+    - **limit**: Page size (opt-in keyset pagination, ordered by room number)
+    - **cursor**: Value of the `X-Next-Cursor` header from the previous page
     """
-    service = HotelService(db)
-    return service.get_all_rooms(category=category, status_filter=status_filter)
+    items = await service.get_all_rooms(
+        category=category, status_filter=status_filter, limit=limit, cursor=cursor,
+        raw=settings.fast_responses
+    )
+    return list_response(response, items, "number", limit)
 
 
-@router.get("/free", response_model=List[RoomResponse])
-def get_free_rooms(
+@router.get("/free", response_model=List[RoomResponse], dependencies=[Depends(conditional_get)])
+async def get_free_rooms(
+    response: Response,
     category: Optional[RoomCategory] = None,
-    db: Session = Depends(get_db)
+    service=Depends(get_read_hotel_service)
 ):
     """
     Get all free rooms, optionally filtered by category.
     - **category**: Filter by room category (стандарт, комфорт, люкс, президентський)
     """
-    service = HotelService(db)
-    return service.get_free_rooms(category=category)
+    items = await service.get_free_rooms(category=category, raw=settings.fast_responses)
+    return list_response(response, items, "number")
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def room_status_events(category: Optional[RoomCategory] = None):
+    """
+    Live feed of room status changes as Server-Sent Events.
+
+    Every committed booking, rental, cancellation, completion or new room produces a
+    `rooms` event with the changed rooms (number, category, status, previous_status),
+    optionally filtered by category. A `resync` event means changes were missed and
+    the client should reload the room list.
+    """
+    return StreamingResponse(
+        room_event_stream(category),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/available", response_model=List[RoomResponse])
+async def get_available_rooms(
+    start: date,
+    end: date,
+    category: Optional[RoomCategory] = None,
+    service=Depends(get_read_hotel_service)
+):
+    """
+    Get rooms with no booking or rental overlapping the stay [start, end).
+    - **start**: Check-in date
+    - **end**: Check-out date (must be after start)
+    - **category**: Filter by room category (стандарт, комфорт, люкс, президентський)
+    """
+    return await service.get_available_rooms(start, end, category=category)
 
 
 @router.get("/{room_number}", response_model=RoomResponse)
-def get_room_by_number(
+async def get_room_by_number(
     room_number: int,
-    db: Session = Depends(get_db)
+    service=Depends(get_read_hotel_service)
 ):
     """Get a specific room by its number."""
-    service = HotelService(db)
-    room = service.get_room_by_number(room_number)
+    room = await service.get_room(room_number)
 
     if not room:
-        from fastapi import HTTPException
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Room number {room_number} not found"
         )
 
-    return service._room_to_response(room)
+    return RoomResponse.model_validate(room)
@@ -1,15 +1,17 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query
+from typing import Dict, Optional
+from datetime import date
 
-from app.database.database import get_db
-from app.services.hotel_service import HotelService
-from app.models.schemas import StatisticsResponse
+from app.dependencies import get_hotel_service, get_read_hotel_service, conditional_get
+from app.models.schemas import StatisticsResponse, CacheStatsResponse, RevenueStatisticsResponse, OccupancyResponse
+from app.models.enums import RoomCategory
+from app.services.cache import ROOM_CACHES
 
 router = APIRouter(prefix="/statistics", tags=["Statistics"])
 
 
-@router.get("/", response_model=StatisticsResponse)
-def get_statistics(db: Session = Depends(get_db)):
+@router.get("/", response_model=StatisticsResponse, dependencies=[Depends(conditional_get)])
+async def get_statistics(service=Depends(get_read_hotel_service)):
     """
     Get hotel statistics including:
     - Total number of rooms
@@ -18,5 +20,43 @@ def get_statistics(db: Session = Depends(get_db)):
     - Number of rented rooms
     - Occupancy rate (percentage)
     """
-    service = HotelService(db)
-    return service.get_statistics()
+    return await service.get_statistics()
+
+
+@router.get("/revenue", response_model=RevenueStatisticsResponse, dependencies=[Depends(conditional_get)])
+async def get_revenue_statistics(
+    date_from: date = Query(..., alias="from", description="First night, inclusive"),
+    date_to: date = Query(..., alias="to", description="Last night, inclusive"),
+    service=Depends(get_read_hotel_service)
+):
+    """
+    Revenue and occupied room-nights of completed rentals, per category and per night.
+
+    Answered from the daily_revenue rollups, which are updated when a rental completes.
+    """
+    return await service.get_revenue_statistics(date_from, date_to)
+
+
+@router.get("/occupancy", response_model=OccupancyResponse, dependencies=[Depends(conditional_get)])
+async def get_occupancy(
+    date_from: date = Query(..., alias="from", description="First night, inclusive"),
+    date_to: date = Query(..., alias="to", description="Last night, inclusive"),
+    category: Optional[RoomCategory] = None,
+    service=Depends(get_hotel_service)
+):
+    """
+    Booked and rented room-nights per night and per category, for current and future
+    reservations (up to OCCUPANCY_HORIZON_DAYS nights ahead).
+
+    Served from this worker's in-memory occupancy matrix, kept current on every write.
+    The matrix is (re)built on the primary, never a replica: writes are replayed onto it
+    as they commit, so it must not start from a snapshot that lags behind them. The
+    session connects only when a build is needed.
+    """
+    return await service.get_occupancy(date_from, date_to, category)
+
+
+@router.get("/cache", response_model=Dict[str, CacheStatsResponse])
+def get_cache_statistics():
+    """Hit/miss/eviction counters of this worker's room inventory caches."""
+    return {cache.name: cache.stats() for cache in ROOM_CACHES}
@@ -0,0 +1,81 @@
+import logging
+from functools import partial
+from typing import TYPE_CHECKING, Awaitable, Callable
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.database.database import REPLICA_FAILURES
+from app.services.hotel_service import HotelService
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHotelService:
+    """
+    Awaitable facade over HotelService bound to an AsyncSession.
+
+    Every public HotelService method becomes a coroutine that runs the business
+    logic through AsyncSession.run_sync, so SQL round-trips are awaited on the
+    event loop by the async driver instead of blocking a threadpool worker.
+    """
+
+    def __init__(self, db: "AsyncSession"):
+        self.db = db
+
+    def __getattr__(self, name: str):
+        method = getattr(HotelService, name)
+
+        async def call(*args, **kwargs):
+            return await self.db.run_sync(
+                lambda session: method(HotelService(session), *args, **kwargs)
+            )
+
+        return call
+
+
+class ThreadedHotelService:
+    """Same awaitable interface for sync mode: calls run in the AnyIO threadpool."""
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._service = HotelService(db)
+
+    def __getattr__(self, name: str):
+        method = getattr(self._service, name)
+
+        async def call(*args, **kwargs):
+            return await run_in_threadpool(partial(method, *args, **kwargs))
+
+        return call
+
+
+class ReplicaHotelService:
+    """
+    Read-only calls on a replica-bound service, with fallback to the primary.
+
+    If the replica fails at the connection level, it is reported via `on_failure`
+    and the call (and every later one in this request) is repeated on a primary
+    service opened lazily by `open_primary`.
+    """
+
+    def __init__(self, service, on_failure: Callable[[], None], open_primary: Callable[[], Awaitable]):
+        self._service = service
+        self._on_failure = on_failure
+        self._open_primary = open_primary
+        self._primary = None
+
+    def __getattr__(self, name: str):
+        async def call(*args, **kwargs):
+            if self._primary is None:
+                try:
+                    return await getattr(self._service, name)(*args, **kwargs)
+                except REPLICA_FAILURES:
+                    logger.warning("Read replica failed, falling back to the primary", exc_info=True)
+                    self._on_failure()
+                    self._primary = await self._open_primary()
+            return await getattr(self._primary, name)(*args, **kwargs)
+
+        return call
@@ -0,0 +1,152 @@
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from app.config import get_settings
+
+settings = get_settings()
+
+_MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe bounded cache: entries expire after `ttl` seconds, least recently used go first.
+
+    `generation` changes on every invalidation. A caller that read it before loading a value
+    passes it to `set`, which drops the value if an invalidation happened in between, so a
+    load that raced with a write never stores what the write already replaced.
+    """
+
+    def __init__(self, name: str, max_size: int, ttl: float):
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.generation = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING or entry[0] < time.monotonic():
+                if entry is not _MISSING:
+                    del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self.generation += 1
+            if self._data.pop(key, _MISSING) is not _MISSING:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self.generation += 1
+            if self._data:
+                self.invalidations += 1
+            self._data.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def _room_cache(name: str, max_size: Optional[int] = None) -> TTLCache:
+    size = settings.room_cache_size if settings.room_cache_enabled else 0
+    return TTLCache(name, size if max_size is None else min(size, max_size), settings.room_cache_ttl)
+
+
+# room number -> RoomResponse (/rooms/{number}); dropped on every status-changing write
+room_details = _room_cache("room_details")
+# filtered room listings (/rooms/, /rooms/free); dropped on every status-changing write
+room_lists = _room_cache("room_lists", max_size=256)
+
+ROOM_CACHES = (room_details, room_lists)
+
+
+class DataVersion:
+    """
+    Cheap validator for conditional GETs, changed by every state-changing write.
+
+    On Postgres every committed write draws a version from data_version_seq and sends it
+    to the other workers, so all workers converge on the same version and tokens. Writes
+    without a shared version (other databases, a failed notification) bump a local counter;
+    tokens then include a per-process boot id, as those counters are not comparable.
+    A time bucket makes a lost cross-worker notification cost a client at most `max_age`
+    seconds of staleness.
+    """
+
+    def __init__(self, max_age: int):
+        self.boot_id = uuid.uuid4().hex[:8]
+        self.max_age = max(1, max_age)
+        self.shared: Optional[int] = None
+        self.local = 0
+        self._lock = threading.Lock()
+
+    def bump(self, version: Optional[int] = None) -> None:
+        with self._lock:
+            if version is None:
+                self.local += 1
+            elif self.shared is None or version > self.shared:
+                self.shared = version
+                self.local = 0
+            # else: an older version delivered late; its change was committed before
+            # the current version was drawn, so current tokens already cover it
+
+    def etag(self, variant: str = "") -> str:
+        bucket = int(time.time() // self.max_age)
+        if self.shared is None:
+            version = f"{self.boot_id}-{self.local}"
+        elif self.local:
+            version = f"{self.shared}.{self.boot_id}-{self.local}"
+        else:
+            version = str(self.shared)
+        return f'W/"{version}-{bucket}-{zlib.crc32(variant.encode()):08x}"'
+
+
+data_version = DataVersion(settings.etag_max_age)
+
+
+def invalidate_room_caches() -> None:
+    room_details.clear()
+    room_lists.clear()
+
+
+def rooms_changed(version: Optional[int] = None) -> None:
+    """
+    Called after every committed room/reservation change, local or from another worker,
+    with the change's shared data version if it has one.
+    """
+    invalidate_room_caches()
+    data_version.bump(version)
@@ -0,0 +1,119 @@
+import asyncio
+import json
+from contextlib import contextmanager
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Set
+
+from app.models.enums import RoomCategory
+
+# Events buffered per client; a client that falls this far behind is told to resync.
+SUBSCRIBER_QUEUE_SIZE = 100
+
+# More room deltas than this are not sent through pg_notify; listeners get a resync
+# event instead. Payloads are also capped by encoded size (notifications.MAX_PAYLOAD_BYTES).
+MAX_NOTIFY_DELTAS = 50
+
+# Comment line sent on idle connections so proxies and load balancers keep them open
+HEARTBEAT_SECONDS = 15.0
+
+RESYNC = b"event: resync\ndata: {}\n\n"
+
+
+def sse_message(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n".encode()
+
+
+class Subscriber:
+    def __init__(self, category: Optional[RoomCategory]):
+        self.category = category
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+
+
+class RoomEventBroker:
+    """
+    In-process fan-out of room status deltas to connected SSE clients.
+
+    publish() may be called from any thread (threadpool workers, the LISTEN thread);
+    it hands the deltas to the event loop with a single call_soon_threadsafe, and the
+    loop encodes each message once per category filter before queueing it to clients.
+    """
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Set[Subscriber] = set()
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def stop(self) -> None:
+        self._loop = None
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @contextmanager
+    def subscribe(self, category: Optional[RoomCategory] = None) -> Iterator[Subscriber]:
+        subscriber = Subscriber(category)
+        self._subscribers.add(subscriber)
+        try:
+            yield subscriber
+        finally:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, deltas: Optional[List[dict]]) -> None:
+        """Queue room deltas for delivery; None means "changes unknown, clients must resync"."""
+        loop = self._loop
+        if loop is None or not self._subscribers:
+            return
+        try:
+            loop.call_soon_threadsafe(self._fan_out, deltas)
+        except RuntimeError:
+            # The loop is closing during shutdown
+            pass
+
+    def _fan_out(self, deltas: Optional[List[dict]]) -> None:
+        messages: Dict[Optional[RoomCategory], Optional[bytes]] = {}
+        for subscriber in list(self._subscribers):
+            if subscriber.category not in messages:
+                messages[subscriber.category] = self._encode(deltas, subscriber.category)
+            message = messages[subscriber.category]
+            if message is None:
+                continue
+            try:
+                subscriber.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Too slow to keep up: replace its backlog with a single resync
+                self._reset(subscriber)
+
+    @staticmethod
+    def _encode(deltas: Optional[List[dict]], category: Optional[RoomCategory]) -> Optional[bytes]:
+        if deltas is None:
+            return RESYNC
+        rooms = [delta for delta in deltas if category is None or delta["category"] == category.value]
+        if not rooms:
+            return None
+        return sse_message("rooms", {"rooms": rooms})
+
+    @staticmethod
+    def _reset(subscriber: Subscriber) -> None:
+        while not subscriber.queue.empty():
+            subscriber.queue.get_nowait()
+        subscriber.queue.put_nowait(RESYNC)
+
+
+room_events = RoomEventBroker()
+
+
+async def room_event_stream(category: Optional[RoomCategory] = None) -> AsyncIterator[bytes]:
+    """
+    SSE body for one client: a "ready" event, then "rooms" events with the deltas
+    of every committed change ("resync" when they are unknown, e.g. the client fell
+    behind), and heartbeat comments in between.
+    """
+    with room_events.subscribe(category) as subscriber:
+        yield b"retry: 3000\n\n" + sse_message("ready", {"category": category.value if category else None})
+        while True:
+            try:
+                yield await asyncio.wait_for(subscriber.queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield b": heartbeat\n\n"
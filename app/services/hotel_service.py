@@ -1,21 +1,55 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import select, update, func, exists, and_, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, joinedload
 from fastapi import HTTPException, status
-from typing import List, Optional
-from datetime import date
+from typing import Dict, Iterator, List, Optional, Tuple
+from collections import Counter
+from datetime import date, timedelta
+import csv
+import io
+import json
+import numpy as np
 
 from app.models.room import Room
+from app.models.reservation import Reservation
 from app.models.booking import Booking
 from app.models.rental import Rental
-from app.models.enums import RoomStatus, RoomCategory
+from app.models.room_counter import RoomCounter
+from app.models.reservation_history import ReservationHistory, DailyRevenue
+from app.config import get_settings
+from app.models.enums import (
+    RoomStatus, RoomCategory, ExportFormat, ReservationKind, ReservationOutcome, ReservationState
+)
+from app.services.pagination import decode_cursor
+from app.services.cache import TTLCache, room_details, room_lists, rooms_changed
+from app.services.notifications import notify, ROOMS_CHANNEL
+from app.services.events import room_events, MAX_NOTIFY_DELTAS
+from app.services.occupancy import occupancy_calendar, StayChange, KIND_FLAGS, CATEGORIES
 from app.models.schemas import (
-    RoomCreate, RoomResponse, BookingCreate, BookingResponse,
-    RentalCreate, RentalResponse, StatisticsResponse
+    RoomCreate, RoomResponse, RoomBulkResponse, RoomBulkItemResult, BookingCreate, BookingResponse,
+    GroupBookingCreate, GroupBookingResponse, RoomConflict, AutoBookingCreate, AutoRentalCreate,
+    RentalCreate, RentalResponse, StatisticsResponse, CategoryStatistics,
+    RevenueStatisticsResponse, RevenueTotals, DailyRevenueItem,
+    OccupancyResponse, OccupancyTotals, OccupancyDay
 )
 
 
+EXPORT_BATCH_SIZE = 1000
+BULK_INSERT_CHUNK_SIZE = 1000
+AUTO_ASSIGN_ATTEMPTS = 5
+
+ROOM_ROW_COLUMNS = (Room.id, Room.number, Room.category, Room.status)
+
+
 class HotelService:
     def __init__(self, db: Session):
         self.db = db
+        self.settings = get_settings()
+        # Room status and stay changes of the current transaction, published after commit
+        self._room_deltas: List[dict] = []
+        self._stay_changes: List[StayChange] = []
+        # Net room_counters changes of the current transaction, written just before commit
+        self._counter_deltas: Counter = Counter()
 
     def create_room(self, room_data: RoomCreate) -> RoomResponse:
         existing_room = self.db.query(Room).filter(Room.number == room_data.number).first()
@@ -31,51 +65,146 @@ class HotelService:
             status=RoomStatus.FREE
         )
         self.db.add(room)
-        self.db.commit()
+        self._count_room(room.category, RoomStatus.FREE, 1)
+        self._record_room_delta(room.number, room.category, RoomStatus.FREE)
+        self._commit_room_changes()
         self.db.refresh(room)
 
         return self._room_to_response(room)
 
-    def get_room_by_number(self, room_number: int) -> Optional[Room]:
-        return self.db.query(Room).filter(Room.number == room_number).first()
+    def create_rooms_bulk(self, rooms_data: List[RoomCreate]) -> RoomBulkResponse:
+        unique: Dict[int, RoomCreate] = {}
+        for room_data in rooms_data:
+            unique.setdefault(room_data.number, room_data)
+
+        # Multi-row INSERT ... ON CONFLICT (number) DO NOTHING RETURNING: rooms that
+        # already exist are skipped by the database instead of aborting the batch.
+        created: Dict[int, int] = {}
+        items = list(unique.values())
+        for offset in range(0, len(items), BULK_INSERT_CHUNK_SIZE):
+            chunk = items[offset:offset + BULK_INSERT_CHUNK_SIZE]
+            stmt = (
+                self._insert(Room)
+                .values([
+                    {"number": r.number, "category": r.category, "status": RoomStatus.FREE}
+                    for r in chunk
+                ])
+                .on_conflict_do_nothing(index_elements=[Room.number])
+                .returning(Room.id, Room.number)
+            )
+            created.update({number: room_id for room_id, number in self.db.execute(stmt)})
+
+        per_category = Counter(unique[number].category for number in created)
+        for category, count in per_category.items():
+            self._count_room(category, RoomStatus.FREE, count)
+        for number in created:
+            self._record_room_delta(number, unique[number].category, RoomStatus.FREE)
+        self._commit_room_changes()
+
+        results = []
+        duplicates = []
+        seen = set()
+        for room_data in rooms_data:
+            number = room_data.number
+            if number in created and number not in seen:
+                results.append(RoomBulkItemResult(number=number, created=True, id=created[number]))
+            else:
+                duplicates.append(number)
+                results.append(RoomBulkItemResult(
+                    number=number,
+                    created=False,
+                    detail=(
+                        f"Room number {number} is repeated in the request" if number in seen
+                        else f"Room number {number} already exists"
+                    )
+                ))
+            seen.add(number)
+
+        return RoomBulkResponse(created=len(created), duplicates=duplicates, results=results)
+
+    def get_room_by_number(self, room_number: int, for_update: bool = False) -> Optional[Room]:
+        query = self.db.query(Room).filter(Room.number == room_number)
+        if for_update:
+            query = query.with_for_update()
+        return query.first()
+
+    def get_room(self, room_number: int) -> Optional[RoomResponse]:
+        """Read-only lookup for GET /rooms/{number}; a cache hit runs no query."""
+        def load() -> Optional[RoomResponse]:
+            room = self.get_room_by_number(room_number)
+            return self._room_to_response(room) if room else None
+
+        return self._cached(room_details, room_number, load)
 
     def get_all_rooms(
         self,
         category: Optional[RoomCategory] = None,
-        status_filter: Optional[RoomStatus] = None
+        status_filter: Optional[RoomStatus] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        raw: bool = False
     ) -> List[RoomResponse]:
-        query = self.db.query(Room)
+        """With raw=True rows are plain dicts built from column tuples (fast response path)."""
+        query = self.db.query(*ROOM_ROW_COLUMNS) if raw else self.db.query(Room)
 
         if category:
             query = query.filter(Room.category == category)
         if status_filter:
             query = query.filter(Room.status == status_filter)
 
-        rooms = query.all()
-        return [self._room_to_response(room) for room in rooms]
+        query = self._paginate(query, Room.number, limit, cursor)
+        return self._cached_room_list(("all", category, status_filter, limit, cursor, raw), query, raw)
+
+    def get_free_rooms(self, category: Optional[RoomCategory] = None, raw: bool = False) -> List[RoomResponse]:
+        query = self.db.query(*ROOM_ROW_COLUMNS) if raw else self.db.query(Room)
+        query = query.filter(Room.status == RoomStatus.FREE)
+
+        if category:
+            query = query.filter(Room.category == category)
+
+        return self._cached_room_list(("free", category, raw), query, raw)
+
+    def _cached_room_list(self, key: tuple, query, raw: bool = False) -> List[RoomResponse]:
+        to_item = self._room_row if raw else self._room_to_response
+        return self._cached(room_lists, key, lambda: [to_item(room) for room in query.all()])
 
-    def get_free_rooms(self, category: Optional[RoomCategory] = None) -> List[RoomResponse]:
-        query = self.db.query(Room).filter(Room.status == RoomStatus.FREE)
+    def _cached(self, cache: TTLCache, key, load):
+        value = cache.get(key)
+        if value is None:
+            # Taken before the query: a write committed meanwhile bumps it and the result is not stored
+            generation = cache.generation
+            value = load()
+            # A replica may still lag behind writes that already invalidated the cache
+            if value is not None and "replica" not in self.db.info:
+                cache.set(key, value, generation)
+        return value
+
+    def get_available_rooms(
+        self,
+        start_date: date,
+        end_date: date,
+        category: Optional[RoomCategory] = None
+    ) -> List[RoomResponse]:
+        self._validate_stay(start_date, end_date)
 
+        query = self.db.query(Room).filter(~self._reservation_overlaps(start_date, end_date))
         if category:
             query = query.filter(Room.category == category)
 
-        rooms = query.all()
+        rooms = query.order_by(Room.number).all()
         return [self._room_to_response(room) for room in rooms]
 
     def create_booking(self, booking_data: BookingCreate) -> BookingResponse:
-        room = self.get_room_by_number(booking_data.room_number)
+        # The room row lock serializes concurrent reservations of the same room
+        # between the overlap check and the insert.
+        room = self.get_room_by_number(booking_data.room_number, for_update=True)
         if not room:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Room number {booking_data.room_number} not found"
             )
 
-        if room.status != RoomStatus.FREE:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Room {booking_data.room_number} is not available (status: {room.status.value})"
-            )
+        self._ensure_room_available(room, booking_data.start_date, booking_data.end_date)
 
         booking = Booking(
             room_id=room.id,
@@ -84,14 +213,106 @@ class HotelService:
             end_date=booking_data.end_date
         )
 
-        room.status = RoomStatus.BOOKED
+        if room.status == RoomStatus.FREE:
+            self._set_room_status(room, RoomStatus.BOOKED)
 
         self.db.add(booking)
-        self.db.commit()
+        self._record_stay(room.id, ReservationKind.BOOKING, booking.start_date, booking.end_date, added=True)
+        self._commit_room_changes()
         self.db.refresh(booking)
 
         return self._booking_to_response(booking, room)
 
+    def create_auto_booking(self, booking_data: AutoBookingCreate) -> BookingResponse:
+        room = self._claim_free_room(booking_data.category, booking_data.start_date, booking_data.end_date)
+
+        booking = Booking(
+            room_id=room.id,
+            guest_name=booking_data.guest_name,
+            start_date=booking_data.start_date,
+            end_date=booking_data.end_date
+        )
+
+        if room.status == RoomStatus.FREE:
+            self._set_room_status(room, RoomStatus.BOOKED)
+
+        self.db.add(booking)
+        self._record_stay(room.id, ReservationKind.BOOKING, booking.start_date, booking.end_date, added=True)
+        self._commit_room_changes()
+        self.db.refresh(booking)
+
+        return self._booking_to_response(booking, room)
+
+    def create_group_booking(self, group_data: GroupBookingCreate) -> GroupBookingResponse:
+        # Lock all target rooms up front in primary-key order: concurrent group bookings
+        # that share rooms acquire locks in the same order and cannot deadlock.
+        rooms = (
+            self.db.query(Room)
+            .filter(Room.number.in_(group_data.room_numbers))
+            .order_by(Room.id)
+            .with_for_update()
+            .all()
+        )
+        rooms_by_number = {room.number: room for room in rooms}
+
+        conflicts = [
+            RoomConflict(room_number=number, reason="Room not found")
+            for number in group_data.room_numbers
+            if number not in rooms_by_number
+        ]
+        busy_room_ids = self._overlapping_room_ids(
+            [room.id for room in rooms], group_data.start_date, group_data.end_date
+        )
+        conflicts += [
+            RoomConflict(
+                room_number=room.number,
+                reason=f"Not available from {group_data.start_date} to {group_data.end_date}"
+            )
+            for room in rooms
+            if room.id in busy_room_ids
+        ]
+
+        if conflicts:
+            self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail={
+                    "message": "Group booking rejected, no rooms were booked",
+                    "conflicts": [conflict.model_dump() for conflict in conflicts]
+                }
+            )
+
+        bookings = [
+            Booking(
+                room_id=rooms_by_number[number].id,
+                guest_name=group_data.guest_name,
+                start_date=group_data.start_date,
+                end_date=group_data.end_date
+            )
+            for number in group_data.room_numbers
+        ]
+        self.db.add_all(bookings)
+        for booking in bookings:
+            self._record_stay(booking.room_id, ReservationKind.BOOKING, booking.start_date, booking.end_date, added=True)
+        for room in rooms:
+            if room.status == RoomStatus.FREE:
+                self._set_room_status(room, RoomStatus.BOOKED)
+
+        # Flushed as one batched INSERT ... RETURNING (insertmanyvalues); responses are
+        # built before commit so the expired objects need no reload afterwards.
+        self.db.flush()
+        responses = [
+            self._booking_to_response(booking, rooms_by_number[number])
+            for booking, number in zip(bookings, group_data.room_numbers)
+        ]
+        self._commit_room_changes()
+
+        return GroupBookingResponse(
+            guest_name=group_data.guest_name,
+            bookings=responses,
+            total_estimated_cost=sum(response.estimated_cost for response in responses)
+        )
+
     def delete_booking(self, booking_id: int) -> dict:
         booking = self.db.query(Booking).filter(Booking.id == booking_id).first()
         if not booking:
@@ -100,43 +321,98 @@ class HotelService:
                 detail=f"Booking {booking_id} not found"
             )
 
-        room = self.db.query(Room).filter(Room.id == booking.room_id).first()
+        room = self.db.query(Room).filter(Room.id == booking.room_id).with_for_update().first()
         if not room:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Room not found"
             )
 
-        room.status = RoomStatus.FREE
-
+        self._archive_reservation(ReservationKind.BOOKING, booking, room, ReservationOutcome.CANCELLED, 0.0)
+        self._record_stay(room.id, ReservationKind.BOOKING, booking.start_date, booking.end_date, added=False)
         self.db.delete(booking)
-        self.db.commit()
+        self.db.flush()
+        self._refresh_room_status(room)
+        self._commit_room_changes()
 
         return {"message": f"Booking {booking_id} deleted successfully", "room_number": room.number}
 
-    def get_all_bookings(self) -> List[BookingResponse]:
-        bookings = self.db.query(Booking).all()
-        result = []
-        for booking in bookings:
-            room = self.db.query(Room).filter(Room.id == booking.room_id).first()
-            if room:
-                result.append(self._booking_to_response(booking, room))
-        return result
+    def check_in_booking(self, booking_id: int) -> RentalResponse:
+        """Turn a booking into a rental in place: same record and id, one UPDATE of its state."""
+        booking = self.db.get(Reservation, booking_id)
+        if booking is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Booking {booking_id} not found"
+            )
+        if booking.state != ReservationState.BOOKED:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Booking {booking_id} is already checked in"
+            )
 
-    def create_rental(self, rental_data: RentalCreate) -> RentalResponse:
-        room = self.get_room_by_number(rental_data.room_number)
+        room = self.db.query(Room).filter(Room.id == booking.room_id).with_for_update().first()
         if not room:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Room number {rental_data.room_number} not found"
+                detail=f"Room not found"
             )
 
-        if room.status != RoomStatus.FREE:
+        # The state guard makes a concurrent check-in or cancellation of the same booking a no-op
+        result = self.db.execute(
+            update(Reservation)
+            .where(Reservation.id == booking_id, Reservation.state == ReservationState.BOOKED)
+            .values(state=ReservationState.RENTED)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            self.db.rollback()
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Room {rental_data.room_number} is not available (status: {room.status.value})"
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Booking {booking_id} was checked in or cancelled concurrently"
+            )
+
+        # The loaded object is still mapped as a Booking; the row is a Rental from now on
+        self.db.expunge(booking)
+        self._set_room_status(room, RoomStatus.RENTED)
+        self._record_stay(room.id, ReservationKind.BOOKING, booking.start_date, booking.end_date, added=False)
+        self._record_stay(room.id, ReservationKind.RENTAL, booking.start_date, booking.end_date, added=True)
+        response = self._rental_to_response(booking, room)
+        self._commit_room_changes()
+
+        return response
+
+    def get_all_bookings(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        raw: bool = False
+    ) -> List[BookingResponse]:
+        if raw:
+            stmt = self._paginate(self._reservation_rows(Booking), Booking.id, limit, cursor)
+            fields = self._reservation_fields("estimated_cost")
+            return [dict(zip(fields, self._reservation_values(row))) for row in self.db.execute(stmt)]
+
+        query = self.db.query(Booking).options(joinedload(Booking.room))
+        bookings = self._paginate(query, Booking.id, limit, cursor).all()
+        return [
+            self._booking_to_response(booking, booking.room)
+            for booking in bookings
+            if booking.room
+        ]
+
+    def create_rental(self, rental_data: RentalCreate) -> RentalResponse:
+        # The room row lock serializes concurrent reservations of the same room
+        # between the overlap check and the insert.
+        room = self.get_room_by_number(rental_data.room_number, for_update=True)
+        if not room:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Room number {rental_data.room_number} not found"
             )
 
+        self._ensure_room_available(room, rental_data.start_date, rental_data.end_date)
+
         rental = Rental(
             room_id=room.id,
             guest_name=rental_data.guest_name,
@@ -144,10 +420,30 @@ class HotelService:
             end_date=rental_data.end_date
         )
 
-        room.status = RoomStatus.RENTED
+        self._set_room_status(room, RoomStatus.RENTED)
 
         self.db.add(rental)
-        self.db.commit()
+        self._record_stay(room.id, ReservationKind.RENTAL, rental.start_date, rental.end_date, added=True)
+        self._commit_room_changes()
+        self.db.refresh(rental)
+
+        return self._rental_to_response(rental, room)
+
+    def create_auto_rental(self, rental_data: AutoRentalCreate) -> RentalResponse:
+        room = self._claim_free_room(rental_data.category, rental_data.start_date, rental_data.end_date)
+
+        rental = Rental(
+            room_id=room.id,
+            guest_name=rental_data.guest_name,
+            start_date=rental_data.start_date,
+            end_date=rental_data.end_date
+        )
+
+        self._set_room_status(room, RoomStatus.RENTED)
+
+        self.db.add(rental)
+        self._record_stay(room.id, ReservationKind.RENTAL, rental.start_date, rental.end_date, added=True)
+        self._commit_room_changes()
         self.db.refresh(rental)
 
         return self._rental_to_response(rental, room)
@@ -160,7 +456,7 @@ class HotelService:
                 detail=f"Rental {rental_id} not found"
             )
 
-        room = self.db.query(Room).filter(Room.id == rental.room_id).first()
+        room = self.db.query(Room).filter(Room.id == rental.room_id).with_for_update().first()
         if not room:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -170,10 +466,14 @@ class HotelService:
         days = rental.duration_days
         total_cost = days * room.price
 
-        room.status = RoomStatus.FREE
-
+        # History, rollups and the delete share one transaction
+        self._archive_reservation(ReservationKind.RENTAL, rental, room, ReservationOutcome.COMPLETED, total_cost)
+        self._roll_up_revenue(room.category, rental.start_date, rental.end_date, room.price)
+        self._record_stay(room.id, ReservationKind.RENTAL, rental.start_date, rental.end_date, added=False)
         self.db.delete(rental)
-        self.db.commit()
+        self.db.flush()
+        self._refresh_room_status(room)
+        self._commit_room_changes()
 
         return {
             "message": f"Rental {rental_id} completed successfully",
@@ -182,20 +482,112 @@ class HotelService:
             "total_cost": total_cost
         }
 
-    def get_all_rentals(self) -> List[RentalResponse]:
-        rentals = self.db.query(Rental).all()
-        result = []
-        for rental in rentals:
-            room = self.db.query(Room).filter(Room.id == rental.room_id).first()
-            if room:
-                result.append(self._rental_to_response(rental, room))
-        return result
+    def get_all_rentals(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        raw: bool = False
+    ) -> List[RentalResponse]:
+        if raw:
+            stmt = self._paginate(self._reservation_rows(Rental), Rental.id, limit, cursor)
+            fields = self._reservation_fields("total_cost")
+            return [dict(zip(fields, self._reservation_values(row))) for row in self.db.execute(stmt)]
+
+        query = self.db.query(Rental).options(joinedload(Rental.room))
+        rentals = self._paginate(query, Rental.id, limit, cursor).all()
+        return [
+            self._rental_to_response(rental, rental.room)
+            for rental in rentals
+            if rental.room
+        ]
+
+    def export_bookings(self, export_format: ExportFormat) -> Iterator[str]:
+        return self._export_reservations(Booking, "estimated_cost", export_format)
+
+    def export_rentals(self, export_format: ExportFormat) -> Iterator[str]:
+        return self._export_reservations(Rental, "total_cost", export_format)
+
+    def _export_reservations(self, model, cost_field: str, export_format: ExportFormat) -> Iterator[str]:
+        # Plain column rows from a server-side cursor, serialized one batch at a time:
+        # no ORM objects, no response models and no full body held in memory.
+        stmt = (
+            self._reservation_rows(model)
+            .order_by(model.id)
+            .execution_options(stream_results=True, yield_per=EXPORT_BATCH_SIZE)
+        )
+        fields = self._reservation_fields(cost_field)
+
+        if export_format == ExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(fields)
+            yield buffer.getvalue()
+
+        for batch in self.db.execute(stmt).partitions():
+            if export_format == ExportFormat.CSV:
+                buffer.seek(0)
+                buffer.truncate()
+                for row in batch:
+                    writer.writerow(self._reservation_values(row))
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    json.dumps(dict(zip(fields, self._reservation_values(row))), ensure_ascii=False) + "\n"
+                    for row in batch
+                )
+
+    def _reservation_rows(self, model):
+        return (
+            select(
+                model.id, model.room_id, Room.number, model.guest_name,
+                model.start_date, model.end_date, Room.category
+            )
+            .join(Room, Room.id == model.room_id)
+        )
+
+    @staticmethod
+    def _reservation_fields(cost_field: str) -> List[str]:
+        # Same keys, in the same order, as BookingResponse / RentalResponse
+        return [
+            "id", "room_id", "room_number", "guest_name",
+            "start_date", "end_date", "duration_days", cost_field
+        ]
+
+    @staticmethod
+    def _reservation_values(row) -> list:
+        reservation_id, room_id, room_number, guest_name, start_date, end_date, category = row
+        days = (end_date - start_date).days
+        return [
+            reservation_id, room_id, room_number, guest_name,
+            start_date.isoformat(), end_date.isoformat(), days, days * category.price
+        ]
 
     def get_statistics(self) -> StatisticsResponse:
-        total = self.db.query(Room).count()
-        free = self.db.query(Room).filter(Room.status == RoomStatus.FREE).count()
-        booked = self.db.query(Room).filter(Room.status == RoomStatus.BOOKED).count()
-        rented = self.db.query(Room).filter(Room.status == RoomStatus.RENTED).count()
+        if self.settings.statistics_counters:
+            rows = self.db.query(RoomCounter.category, RoomCounter.status, RoomCounter.count).all()
+        else:
+            rows = self._count_rooms_by_category_and_status()
+
+        counts: Dict[RoomCategory, Dict[RoomStatus, int]] = {
+            category: {room_status: 0 for room_status in RoomStatus} for category in RoomCategory
+        }
+        for category, room_status, count in rows:
+            counts[category][room_status] += count
+
+        by_category = {
+            category: CategoryStatistics(
+                total_rooms=sum(per_status.values()),
+                free_rooms=per_status[RoomStatus.FREE],
+                booked_rooms=per_status[RoomStatus.BOOKED],
+                rented_rooms=per_status[RoomStatus.RENTED]
+            )
+            for category, per_status in counts.items()
+        }
+
+        total = sum(item.total_rooms for item in by_category.values())
+        free = sum(item.free_rooms for item in by_category.values())
+        booked = sum(item.booked_rooms for item in by_category.values())
+        rented = sum(item.rented_rooms for item in by_category.values())
 
         occupancy_rate = 0.0
         if total > 0:
@@ -206,8 +598,379 @@ class HotelService:
             free_rooms=free,
             booked_rooms=booked,
             rented_rooms=rented,
-            occupancy_rate=round(occupancy_rate, 2)
+            occupancy_rate=round(occupancy_rate, 2),
+            by_category=by_category
+        )
+
+    def get_revenue_statistics(self, date_from: date, date_to: date) -> RevenueStatisticsResponse:
+        """Revenue and room-nights for the nights date_from..date_to (inclusive), from the rollups."""
+        if date_to < date_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'to' must not be earlier than 'from'"
+            )
+
+        rows = (
+            self.db.query(DailyRevenue.day, DailyRevenue.category, DailyRevenue.revenue, DailyRevenue.room_nights)
+            .filter(DailyRevenue.day >= date_from, DailyRevenue.day <= date_to)
+            .order_by(DailyRevenue.day)
+            .all()
+        )
+
+        by_category = {category: RevenueTotals(revenue=0.0, room_nights=0) for category in RoomCategory}
+        daily: Dict[date, DailyRevenueItem] = {}
+        for day, category, revenue, room_nights in rows:
+            by_category[category].revenue += revenue
+            by_category[category].room_nights += room_nights
+            item = daily.setdefault(day, DailyRevenueItem(day=day, revenue=0.0, room_nights=0))
+            item.revenue += revenue
+            item.room_nights += room_nights
+
+        return RevenueStatisticsResponse(
+            date_from=date_from,
+            date_to=date_to,
+            revenue=sum(item.revenue for item in by_category.values()),
+            room_nights=sum(item.room_nights for item in by_category.values()),
+            by_category=by_category,
+            daily=list(daily.values())
+        )
+
+    def get_occupancy(
+        self,
+        date_from: date,
+        date_to: date,
+        category: Optional[RoomCategory] = None
+    ) -> OccupancyResponse:
+        """Booked/rented room-nights for nights date_from..date_to (inclusive), from the occupancy matrix."""
+        if date_to < date_from:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="'to' must not be earlier than 'from'"
+            )
+        occupancy_calendar.ensure_current(self.db)
+        if not occupancy_calendar.covers(date_from, date_to):
+            last_night = occupancy_calendar.origin + timedelta(days=occupancy_calendar.horizon - 1)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Occupancy is available for nights from {occupancy_calendar.origin} to {last_night}"
+            )
+
+        snapshot = occupancy_calendar.snapshot(date_from, date_to, category)
+        rooms = len(snapshot.categories)
+        nights = snapshot.booked.shape[1]
+        booked_per_night = snapshot.booked.sum(axis=0)
+        rented_per_night = snapshot.rented.sum(axis=0)
+        # Per-category totals: per-room sums, then one bincount over the category codes
+        rooms_per_category = np.bincount(snapshot.categories, minlength=len(CATEGORIES))
+        booked_per_category = np.bincount(
+            snapshot.categories, weights=snapshot.booked.sum(axis=1), minlength=len(CATEGORIES)
+        )
+        rented_per_category = np.bincount(
+            snapshot.categories, weights=snapshot.rented.sum(axis=1), minlength=len(CATEGORIES)
         )
+        by_category = {
+            CATEGORIES[index]: self._occupancy_totals(
+                int(rooms_per_category[index]),
+                nights,
+                int(booked_per_category[index]),
+                int(rented_per_category[index])
+            )
+            for index in np.flatnonzero(rooms_per_category)
+        }
+
+        daily = [
+            OccupancyDay(
+                day=date_from + timedelta(days=offset),
+                booked=booked,
+                rented=rented,
+                occupancy_rate=round((booked + rented) / rooms * 100, 2) if rooms else 0.0
+            )
+            for offset, (booked, rented) in enumerate(zip(booked_per_night.tolist(), rented_per_night.tolist()))
+        ]
+
+        return OccupancyResponse(
+            date_from=date_from,
+            date_to=date_to,
+            category=category,
+            **self._occupancy_totals(
+                rooms, nights, int(booked_per_night.sum()), int(rented_per_night.sum())
+            ).model_dump(),
+            by_category=by_category,
+            daily=daily
+        )
+
+    @staticmethod
+    def _occupancy_totals(rooms: int, nights: int, booked: int, rented: int) -> OccupancyTotals:
+        capacity = rooms * nights
+        return OccupancyTotals(
+            rooms=rooms,
+            room_nights=capacity,
+            booked_room_nights=booked,
+            rented_room_nights=rented,
+            occupancy_rate=round((booked + rented) / capacity * 100, 2) if capacity else 0.0
+        )
+
+    def rebuild_room_counters(self) -> None:
+        """
+        Recompute room_counters from the rooms table in one transaction.
+
+        A one-off command (`python -m app.cli rebuild-counters`), safe to run while the
+        app is serving writes.
+        """
+        # Block counter writers before counting. Postgres waits for transactions that already
+        # moved a counter (their room changes are then visible to the count) and holds back
+        # the rest, whose deltas land on top of the rebuilt values. On SQLite the first write
+        # takes the database write lock.
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(text("LOCK TABLE room_counters IN SHARE ROW EXCLUSIVE MODE"))
+        else:
+            self.db.execute(update(RoomCounter).values(count=0))
+
+        counts = {
+            (category, room_status): count
+            for category, room_status, count in self._count_rooms_by_category_and_status()
+        }
+        stmt = self._insert(RoomCounter).values([
+            {"category": category, "status": room_status, "count": counts.get((category, room_status), 0)}
+            for category in RoomCategory
+            for room_status in RoomStatus
+        ])
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[RoomCounter.category, RoomCounter.status],
+            set_={"count": stmt.excluded.count}
+        ))
+        self.db.commit()
+
+    def _count_rooms_by_category_and_status(self) -> List[Tuple[RoomCategory, RoomStatus, int]]:
+        return (
+            self.db.query(Room.category, Room.status, func.count(Room.id))
+            .group_by(Room.category, Room.status)
+            .all()
+        )
+
+    def _validate_stay(self, start_date: date, end_date: date) -> None:
+        if end_date <= start_date:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="End date must be after start date"
+            )
+
+    def _overlap_condition(self, start_date: date, end_date: date):
+        # Stays are half-open [start_date, end_date): checkout day is free for the next guest.
+        if self.db.get_bind().dialect.name == "postgresql":
+            return func.daterange(Reservation.start_date, Reservation.end_date).op("&&")(
+                func.daterange(start_date, end_date)
+            )
+        return and_(Reservation.start_date < end_date, Reservation.end_date > start_date)
+
+    def _reservation_overlaps(self, start_date: date, end_date: date):
+        # Booked and rented stays block a room alike, so one probe covers both states
+        return exists().where(
+            Reservation.room_id == Room.id,
+            self._overlap_condition(start_date, end_date)
+        )
+
+    def _room_has_overlap(self, room_id: int, start_date: date, end_date: date) -> bool:
+        return bool(self.db.query(
+            self._reservation_overlaps(start_date, end_date)
+        ).filter(Room.id == room_id).scalar())
+
+    def _ensure_room_available(self, room: Room, start_date: date, end_date: date) -> None:
+        if self._room_has_overlap(room.id, start_date, end_date):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Room {room.number} is not available from {start_date} to {end_date}"
+            )
+
+    def _claim_free_room(self, category: RoomCategory, start_date: date, end_date: date) -> Room:
+        # FOR UPDATE SKIP LOCKED: concurrent requests each lock a different candidate room
+        # instead of queueing behind the same row lock.
+        skipped: List[int] = []
+        for _ in range(AUTO_ASSIGN_ATTEMPTS):
+            query = self.db.query(Room).filter(
+                Room.category == category,
+                ~self._reservation_overlaps(start_date, end_date)
+            )
+            if skipped:
+                query = query.filter(Room.id.notin_(skipped))
+            room = query.order_by(Room.id).limit(1).with_for_update(skip_locked=True).first()
+            if room is None:
+                break
+            # Re-check under the lock: a competing transaction may have committed a
+            # reservation for this room after our candidate scan took its snapshot.
+            if not self._room_has_overlap(room.id, start_date, end_date):
+                return room
+            skipped.append(room.id)
+
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"No free {category.value} rooms from {start_date} to {end_date}"
+        )
+
+    def _overlapping_room_ids(self, room_ids: List[int], start_date: date, end_date: date) -> set:
+        if not room_ids:
+            return set()
+        rows = self.db.query(Room.id).filter(
+            Room.id.in_(room_ids),
+            self._reservation_overlaps(start_date, end_date)
+        )
+        return {room_id for room_id, in rows}
+
+    def _refresh_room_status(self, room: Room) -> None:
+        # Room.status summarises the room's remaining reservations: rented > booked > free.
+        states = {
+            state for state, in
+            self.db.query(Reservation.state).filter(Reservation.room_id == room.id).distinct()
+        }
+        if ReservationState.RENTED in states:
+            new_status = RoomStatus.RENTED
+        elif ReservationState.BOOKED in states:
+            new_status = RoomStatus.BOOKED
+        else:
+            new_status = RoomStatus.FREE
+        self._set_room_status(room, new_status)
+
+    def _commit_room_changes(self) -> None:
+        # Other workers are notified once the commit has landed: they drop their caches,
+        # move to the new shared ETag version and push the deltas to their live-feed clients.
+        deltas, self._room_deltas = self._room_deltas, []
+        stays, self._stay_changes = self._stay_changes, []
+        rooms = deltas if len(deltas) <= MAX_NOTIFY_DELTAS else None
+        self._write_room_counters()
+        self.db.commit()
+        version = notify(
+            self.db,
+            ROOMS_CHANNEL,
+            {
+                "event": "rooms_changed",
+                "rooms": rooms,
+                "stays": [stay.to_payload() for stay in stays] if len(stays) <= MAX_NOTIFY_DELTAS else None
+            },
+            # Too many bytes: listeners rebuild the occupancy matrix, then also resync live-feed clients
+            {"event": "rooms_changed", "rooms": rooms, "stays": None},
+            {"event": "rooms_changed", "rooms": None, "stays": None}
+        )
+        rooms_changed(version)
+        if any(delta["previous_status"] is None for delta in deltas):
+            # New rooms need new matrix rows
+            occupancy_calendar.invalidate()
+        occupancy_calendar.apply(stays)
+        if deltas:
+            room_events.publish(deltas)
+
+    def _record_stay(self, room_id: int, kind: ReservationKind, start_date: date, end_date: date, added: bool) -> None:
+        self._stay_changes.append(StayChange(room_id, start_date, end_date, KIND_FLAGS[kind], added))
+
+    def _record_room_delta(
+        self,
+        number: int,
+        category: RoomCategory,
+        new_status: RoomStatus,
+        previous_status: Optional[RoomStatus] = None
+    ) -> None:
+        self._room_deltas.append({
+            "number": number,
+            "category": category.value,
+            "status": new_status.value,
+            "previous_status": previous_status.value if previous_status else None
+        })
+
+    def _set_room_status(self, room: Room, new_status: RoomStatus) -> None:
+        if room.status == new_status:
+            return
+        self._count_room(room.category, room.status, -1)
+        self._count_room(room.category, new_status, 1)
+        self._record_room_delta(room.number, room.category, new_status, room.status)
+        room.status = new_status
+
+    def _count_room(self, category: RoomCategory, room_status: RoomStatus, delta: int) -> None:
+        if self.settings.statistics_counters:
+            self._counter_deltas[(category, room_status)] += delta
+
+    def _write_room_counters(self) -> None:
+        # One upsert in the caller's transaction, so counters commit or roll back with the write.
+        # Rows are in a fixed (category, status) order: concurrent writes (a booking and a
+        # cancellation move FREE and BOOKED in opposite directions) lock shared rows in the
+        # same order and cannot deadlock.
+        deltas, self._counter_deltas = self._counter_deltas, Counter()
+        rows = sorted(
+            ((category, room_status, delta) for (category, room_status), delta in deltas.items() if delta),
+            key=lambda row: (CATEGORIES.index(row[0]), list(RoomStatus).index(row[1]))
+        )
+        if not rows:
+            return
+        stmt = self._insert(RoomCounter).values([
+            {"category": category, "status": room_status, "count": delta} for category, room_status, delta in rows
+        ])
+        self.db.execute(stmt.on_conflict_do_update(
+            index_elements=[RoomCounter.category, RoomCounter.status],
+            set_={"count": RoomCounter.count + stmt.excluded.count}
+        ))
+
+    def _archive_reservation(
+        self,
+        kind: ReservationKind,
+        reservation,
+        room: Room,
+        outcome: ReservationOutcome,
+        total_cost: float
+    ) -> None:
+        self.db.add(ReservationHistory(
+            kind=kind,
+            reservation_id=reservation.id,
+            start_date=reservation.start_date,
+            end_date=reservation.end_date,
+            outcome=outcome,
+            room_number=room.number,
+            category=room.category,
+            guest_name=reservation.guest_name,
+            total_cost=total_cost
+        ))
+
+    def _roll_up_revenue(self, category: RoomCategory, start_date: date, end_date: date, price: float) -> None:
+        # One upsert row per night. Nights are in ascending order, so concurrent
+        # completions lock shared daily_revenue rows in the same order.
+        nights = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days)]
+        for offset in range(0, len(nights), BULK_INSERT_CHUNK_SIZE):
+            stmt = self._insert(DailyRevenue).values([
+                {"day": night, "category": category, "revenue": price, "room_nights": 1}
+                for night in nights[offset:offset + BULK_INSERT_CHUNK_SIZE]
+            ])
+            self.db.execute(stmt.on_conflict_do_update(
+                index_elements=[DailyRevenue.day, DailyRevenue.category],
+                set_={
+                    "revenue": DailyRevenue.revenue + stmt.excluded.revenue,
+                    "room_nights": DailyRevenue.room_nights + stmt.excluded.room_nights
+                }
+            ))
+
+    def _insert(self, model):
+        """INSERT construct of the active dialect, for ON CONFLICT clauses."""
+        if self.db.get_bind().dialect.name == "postgresql":
+            return postgresql.insert(model)
+        return sqlite.insert(model)
+
+    def _paginate(self, query, key_column, limit: Optional[int], cursor: Optional[str]):
+        # Keyset pagination: seek past the last seen key on an indexed unique column,
+        # so every page is an index range scan regardless of depth.
+        if cursor:
+            query = query.filter(key_column > decode_cursor(cursor))
+        query = query.order_by(key_column)
+        if limit is not None:
+            query = query.limit(limit)
+        return query
+
+    @staticmethod
+    def _room_row(row) -> dict:
+        room_id, number, category, room_status = row
+        # Same keys, in the same order, as RoomResponse
+        return {
+            "number": number,
+            "category": category.value,
+            "id": room_id,
+            "status": room_status.value,
+            "price": category.price
+        }
 
     def _room_to_response(self, room: Room) -> RoomResponse:
         return RoomResponse(
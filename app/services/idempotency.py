@@ -0,0 +1,275 @@
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, NamedTuple, Optional, Tuple
+
+from fastapi import HTTPException, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, update
+from sqlalchemy.dialects import postgresql, sqlite
+from starlette.concurrency import run_in_threadpool
+
+from app.config import get_settings
+from app.database.database import SessionLocal
+from app.models.idempotency_key import IdempotencyKey
+from app.services.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+# How often a duplicate polls for the original request's result held by another worker
+POLL_INTERVAL = 0.1
+PURGE_INTERVAL = 3600.0
+
+
+class StoredResponse(NamedTuple):
+    fingerprint: str
+    status_code: Optional[int]  # None while the original request is still running
+    body: Any
+
+
+def request_fingerprint(method: str, path: str, body: bytes) -> str:
+    return hashlib.sha256(b"\n".join([method.encode(), path.encode(), body])).hexdigest()
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class IdempotencyStore:
+    """
+    Idempotency-Key rows in the primary database; each call is its own short transaction.
+
+    An unfinished claim expires after `lease` seconds, so a claim orphaned by a crashed
+    worker is taken over by the next retry; `complete` extends the row to `ttl`. The
+    claim's expiry doubles as its owner token: `complete` and `release` only touch the
+    row they claimed, not one a retry took over after their lease ran out.
+    """
+
+    def __init__(self, session_factory, ttl: int, lease: int):
+        self.session_factory = session_factory
+        self.ttl = ttl
+        self.lease = lease
+
+    def claim(self, key: str, fingerprint: str) -> Tuple[Optional[datetime], Optional[StoredResponse]]:
+        """Insert a claim for `key`. Returns (lease expiry, None) if claimed, else (None, existing entry)."""
+        db = self.session_factory()
+        try:
+            now = _utcnow()
+            lease_until = now + timedelta(seconds=self.lease)
+            db.execute(delete(IdempotencyKey).where(IdempotencyKey.key == key, IdempotencyKey.expires_at < now))
+            dialect = postgresql if db.get_bind().dialect.name == "postgresql" else sqlite
+            claimed = db.execute(
+                dialect.insert(IdempotencyKey)
+                .values(key=key, fingerprint=fingerprint, expires_at=lease_until)
+                .on_conflict_do_nothing(index_elements=[IdempotencyKey.key])
+                .returning(IdempotencyKey.key)
+            ).first()
+            db.commit()
+            if claimed:
+                return lease_until, None
+            return None, self._load(db, key)
+        finally:
+            db.close()
+
+    def load(self, key: str) -> Optional[StoredResponse]:
+        db = self.session_factory()
+        try:
+            return self._load(db, key)
+        finally:
+            db.close()
+
+    def complete(self, key: str, lease_until: datetime, stored: StoredResponse) -> None:
+        db = self.session_factory()
+        try:
+            result = db.execute(
+                update(IdempotencyKey)
+                .where(*self._owned(key, lease_until))
+                .values(
+                    status_code=stored.status_code,
+                    response_body=json.dumps(stored.body),
+                    expires_at=_utcnow() + timedelta(seconds=self.ttl)
+                )
+            )
+            db.commit()
+            if result.rowcount == 0:
+                logger.warning("Idempotency key %s was taken over after its lease expired", key)
+        finally:
+            db.close()
+
+    def release(self, key: str, lease_until: datetime) -> None:
+        """Drop an unfinished claim so that a retry runs the request again."""
+        db = self.session_factory()
+        try:
+            db.execute(delete(IdempotencyKey).where(*self._owned(key, lease_until)))
+            db.commit()
+        finally:
+            db.close()
+
+    @staticmethod
+    def _owned(key: str, lease_until: datetime) -> tuple:
+        return (
+            IdempotencyKey.key == key,
+            IdempotencyKey.status_code.is_(None),
+            IdempotencyKey.expires_at == lease_until,
+        )
+
+    def purge_expired(self) -> int:
+        db = self.session_factory()
+        try:
+            result = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < _utcnow()))
+            db.commit()
+            return result.rowcount
+        finally:
+            db.close()
+
+    @staticmethod
+    def _load(db, key: str) -> Optional[StoredResponse]:
+        row = db.get(IdempotencyKey, key)
+        if row is None:
+            return None
+        body = json.loads(row.response_body) if row.response_body is not None else None
+        return StoredResponse(row.fingerprint, row.status_code, body)
+
+
+class Idempotency:
+    """
+    Runs a request at most once per Idempotency-Key and replays its response.
+
+    Duplicates in this worker await the original's future; duplicates in other
+    workers find the claim row and poll it. The in-memory cache answers recent
+    retries without a database round-trip.
+    """
+
+    def __init__(self, store: IdempotencyStore, cache: TTLCache, wait_seconds: float):
+        self.store = store
+        self.cache = cache
+        self.wait_seconds = wait_seconds
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    async def execute(
+        self,
+        key: str,
+        fingerprint: str,
+        success_status: int,
+        call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        stored = self.cache.get(key)
+        if stored is None and key in self._in_flight:
+            stored = await asyncio.shield(self._in_flight[key])
+        if stored is not None:
+            return self._replay(stored, fingerprint)
+
+        future = asyncio.get_running_loop().create_future()
+        # Duplicates that gave up waiting must not leave an unretrieved exception behind
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._in_flight[key] = future
+        try:
+            lease_until, existing = await run_in_threadpool(self.store.claim, key, fingerprint)
+            if lease_until is None:
+                stored = await self._wait_for(key, existing, fingerprint)
+                future.set_result(stored)
+                return self._replay(stored, fingerprint)
+
+            try:
+                result = await call()
+            except HTTPException as error:
+                if error.status_code >= 500:
+                    await run_in_threadpool(self.store.release, key, lease_until)
+                    raise
+                # Client errors are part of the outcome: a retry gets the same answer
+                await self._finish(
+                    key, lease_until, future, StoredResponse(fingerprint, error.status_code, {"detail": error.detail})
+                )
+                raise
+            except BaseException:
+                await run_in_threadpool(self.store.release, key, lease_until)
+                raise
+
+            await self._finish(
+                key, lease_until, future, StoredResponse(fingerprint, success_status, jsonable_encoder(result))
+            )
+            return result
+        except BaseException as error:
+            # In-process duplicates waiting on this request fail the same way
+            if not future.done():
+                future.set_exception(error)
+            raise
+        finally:
+            del self._in_flight[key]
+
+    async def _finish(self, key: str, lease_until: datetime, future: asyncio.Future, stored: StoredResponse) -> None:
+        try:
+            await run_in_threadpool(self.store.complete, key, lease_until, stored)
+        except Exception:
+            # The request itself succeeded; only its replay is lost
+            logger.exception("Could not store the response for idempotency key %s", key)
+        self.cache.set(key, stored)
+        future.set_result(stored)
+
+    async def _wait_for(self, key: str, stored: Optional[StoredResponse], fingerprint: str) -> StoredResponse:
+        deadline = asyncio.get_running_loop().time() + self.wait_seconds
+        while stored is not None and stored.status_code is None:
+            self._check_fingerprint(stored, fingerprint)
+            if asyncio.get_running_loop().time() >= deadline:
+                break
+            await asyncio.sleep(POLL_INTERVAL)
+            stored = await run_in_threadpool(self.store.load, key)
+
+        if stored is None or stored.status_code is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still in progress or failed, retry later",
+                headers={"Retry-After": "1"}
+            )
+        self.cache.set(key, stored)
+        return stored
+
+    def _replay(self, stored: StoredResponse, fingerprint: str) -> JSONResponse:
+        self._check_fingerprint(stored, fingerprint)
+        return JSONResponse(stored.body, status_code=stored.status_code, headers={REPLAYED_HEADER: "true"})
+
+    @staticmethod
+    def _check_fingerprint(stored: StoredResponse, fingerprint: str) -> None:
+        if stored.fingerprint != fingerprint:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request"
+            )
+
+    async def purge_forever(self) -> None:
+        while True:
+            await asyncio.sleep(PURGE_INTERVAL)
+            try:
+                await run_in_threadpool(self.store.purge_expired)
+            except Exception:
+                logger.exception("Could not purge expired idempotency keys")
+
+
+class IdempotencyGuard:
+    """Per-request handle given to routes; without a key it just calls through."""
+
+    def __init__(self, key: Optional[str], fingerprint: str, success_status: int):
+        self.key = key
+        self.fingerprint = fingerprint
+        self.success_status = success_status
+
+    async def run(self, method: Callable[..., Awaitable[Any]], *args) -> Any:
+        if self.key is None:
+            return await method(*args)
+        return await idempotency.execute(self.key, self.fingerprint, self.success_status, partial(method, *args))
+
+
+idempotency = Idempotency(
+    IdempotencyStore(SessionLocal, settings.idempotency_ttl, settings.idempotency_lease_seconds),
+    TTLCache("idempotency", settings.idempotency_cache_size, settings.idempotency_ttl),
+    settings.idempotency_wait_seconds,
+)
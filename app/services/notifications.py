@@ -0,0 +1,143 @@
+import json
+import logging
+import select
+import threading
+import uuid
+from collections import defaultdict
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import Sequence, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.database.database import Base
+
+logger = logging.getLogger(__name__)
+
+# Identifies this worker process so it can ignore its own notifications.
+WORKER_ID = uuid.uuid4().hex
+
+ROOMS_CHANNEL = "hotel_rooms"
+
+# Data version shared by all workers (ETags); every committed change draws the next value
+DATA_VERSION_SEQUENCE = Sequence("data_version_seq", metadata=Base.metadata)
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7999
+# ',"version":' plus a bigint, appended to the encoded payload by the database
+VERSION_FIELD_BYTES = 30
+
+
+def encode_payload(payload: dict) -> str:
+    # UTF-8 rather than \uXXXX escapes: Cyrillic text takes 2 bytes per character instead of 6
+    return json.dumps({"worker": WORKER_ID, **payload}, ensure_ascii=False, separators=(",", ":"))
+
+
+def notify(db: Session, channel: str, payload: dict, *fallbacks: dict) -> Optional[int]:
+    """
+    Notify other workers of a change the caller has just committed.
+
+    The notification carries a new data version drawn from data_version_seq in the same
+    statement. Drawn after the commit, it is higher than any version a reader could have
+    seen before the change became visible. The first of `payload` and `fallbacks` whose
+    encoding fits MAX_PAYLOAD_BYTES is sent.
+
+    Returns the version, or None on other databases or if the notification failed (the
+    change itself is committed either way; other workers catch up via the ETag time bucket).
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    for candidate in (payload, *fallbacks):
+        encoded = encode_payload(candidate)
+        if len(encoded.encode()) + VERSION_FIELD_BYTES <= MAX_PAYLOAD_BYTES:
+            break
+    else:
+        raise ValueError(f"Notification for {channel} exceeds {MAX_PAYLOAD_BYTES} bytes")
+    try:
+        version = db.execute(
+            text(
+                "SELECT version, pg_notify(:channel, left(:payload, -1) || ',\"version\":' || version || '}') "
+                "FROM (SELECT nextval('data_version_seq') AS version) AS drawn"
+            ),
+            {"channel": channel, "payload": encoded}
+        ).scalar()
+        db.commit()
+        return version
+    except SQLAlchemyError:
+        logger.warning("Notification on %s failed after commit", channel, exc_info=True)
+        db.rollback()
+        return None
+
+
+def current_data_version(db: Session) -> Optional[int]:
+    """Latest shared data version, or None on databases without data_version_seq."""
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    return db.execute(text("SELECT last_value FROM data_version_seq")).scalar()
+
+
+class PgListener:
+    """Background thread that LISTENs on Postgres channels and dispatches payloads to handlers."""
+
+    def __init__(self, engine: Engine, poll_interval: float = 5.0):
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self._handlers: Dict[str, List[Callable[[dict], None]]] = defaultdict(list)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def subscribe(self, channel: str, handler: Callable[[dict], None]) -> None:
+        self._handlers[channel].append(handler)
+
+    def start(self) -> None:
+        if self.engine.dialect.name != "postgresql" or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="pg-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.poll_interval + 1)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self._listen()
+            except Exception:
+                logger.exception("LISTEN connection lost, reconnecting")
+                self._stop.wait(self.poll_interval)
+
+    def _listen(self) -> None:
+        # A dedicated connection taken out of the pool: it stays in LISTEN for the process lifetime.
+        raw = self.engine.raw_connection()
+        raw.detach()
+        conn = raw.driver_connection
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                for channel in self._handlers:
+                    cursor.execute(f'LISTEN "{channel}"')
+            while not self._stop.is_set():
+                if select.select([conn], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self._dispatch(conn.notifies.pop(0))
+        finally:
+            conn.close()
+
+    def _dispatch(self, notification) -> None:
+        try:
+            payload = json.loads(notification.payload)
+        except ValueError:
+            return
+        if payload.get("worker") == WORKER_ID:
+            return
+        for handler in self._handlers.get(notification.channel, ()):
+            try:
+                handler(payload)
+            except Exception:
+                logger.exception("Notification handler failed for %s", notification.channel)
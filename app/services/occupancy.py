@@ -0,0 +1,172 @@
+import threading
+from datetime import date, timedelta
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import get_settings
+from app.models.enums import RoomCategory, ReservationKind, ReservationState
+from app.models.reservation import Reservation
+from app.models.room import Room
+
+settings = get_settings()
+
+# Cell flags of the occupancy matrix
+BOOKED = 1
+RENTED = 2
+
+KIND_FLAGS = {ReservationKind.BOOKING: BOOKED, ReservationKind.RENTAL: RENTED}
+STATE_FLAGS = {ReservationState.BOOKED: BOOKED, ReservationState.RENTED: RENTED}
+
+CATEGORIES = list(RoomCategory)
+
+
+class StayChange(NamedTuple):
+    room_id: int
+    start_date: date
+    end_date: date
+    flag: int
+    added: bool
+
+    def to_payload(self) -> list:
+        return [self.room_id, self.start_date.isoformat(), self.end_date.isoformat(), self.flag, self.added]
+
+    @classmethod
+    def from_payload(cls, payload: list) -> "StayChange":
+        room_id, start_date, end_date, flag, added = payload
+        return cls(room_id, date.fromisoformat(start_date), date.fromisoformat(end_date), flag, added)
+
+
+class OccupancySnapshot(NamedTuple):
+    origin: date
+    categories: np.ndarray  # (rooms,) index into CATEGORIES
+    booked: np.ndarray      # (rooms, days) room-nights booked in the selected range
+    rented: np.ndarray
+
+
+class OccupancyCalendar:
+    """
+    In-memory rooms x nights matrix (uint8 flags: BOOKED | RENTED) from `origin` for `horizon` nights.
+
+    Built in bulk from the reservations on first use (and again every day, after a new
+    room or when a change notification was too large), then kept current by applying
+    the stay changes of each committed write. Changes applied while a build is reading
+    the database are replayed onto the new matrix; set/clear of a flag is idempotent.
+
+    No lock is held while a build reads the database: in async mode the reads are awaited
+    on the event loop thread (AsyncSession.run_sync), where a second request blocking on a
+    thread lock would stall the greenlet holding it. Concurrent builds each collect their
+    own pending changes, and whichever finishes last installs its (equally current) matrix.
+    """
+
+    def __init__(self, horizon: int):
+        self.horizon = horizon
+        self.origin: Optional[date] = None
+        self.matrix = np.zeros((0, horizon), dtype=np.uint8)
+        self.categories = np.zeros(0, dtype=np.uint8)
+        self.rows = {}
+        self.stale = True
+        self._lock = threading.Lock()
+        # Changes committed since each in-progress build started reading
+        self._pending: List[List[StayChange]] = []
+
+    def invalidate(self) -> None:
+        self.stale = True
+
+    def ensure_current(self, db: Session) -> None:
+        if not self.stale and self.origin == date.today():
+            return
+        self.build(db)
+
+    def build(self, db: Session) -> None:
+        origin = date.today()
+        end = origin + timedelta(days=self.horizon)
+        pending: List[StayChange] = []
+        with self._lock:
+            self.stale = False
+            self._pending.append(pending)
+
+        try:
+            rooms = db.execute(select(Room.id, Room.category).order_by(Room.id)).all()
+            rows = {room_id: row for row, (room_id, _) in enumerate(rooms)}
+            categories = np.array([CATEGORIES.index(category) for _, category in rooms], dtype=np.uint8)
+            matrix = np.zeros((len(rooms), self.horizon), dtype=np.uint8)
+            stays = db.execute(
+                select(Reservation.state, Reservation.room_id, Reservation.start_date, Reservation.end_date)
+                .where(Reservation.start_date < end, Reservation.end_date > origin)
+            ).all()
+            for state, flag in STATE_FLAGS.items():
+                self._fill(matrix, rows, origin, [stay[1:] for stay in stays if stay[0] == state], flag)
+        except BaseException:
+            with self._lock:
+                self.stale = True
+                self._pending = [other for other in self._pending if other is not pending]
+            raise
+
+        with self._lock:
+            self._pending = [other for other in self._pending if other is not pending]
+            for change in pending:
+                self._apply_one(matrix, rows, origin, change)
+            self.origin, self.rows, self.categories, self.matrix = origin, rows, categories, matrix
+
+    @staticmethod
+    def _fill(matrix: np.ndarray, rows: dict, origin: date, stays: Iterable[Tuple[int, date, date]], flag: int) -> None:
+        # Difference array: +1 at the first night, -1 after the last, cumulative sum > 0 is occupied
+        stays = [(rows[room_id], start, end) for room_id, start, end in stays if room_id in rows]
+        if not stays:
+            return
+        days = matrix.shape[1]
+        room_rows = np.fromiter((row for row, _, _ in stays), dtype=np.int64, count=len(stays))
+        starts = np.fromiter(((start - origin).days for _, start, _ in stays), dtype=np.int64, count=len(stays))
+        ends = np.fromiter(((end - origin).days for _, _, end in stays), dtype=np.int64, count=len(stays))
+        # Stays of one room never overlap, so the running sum stays within 0..1 and int8 suffices
+        diff = np.zeros((matrix.shape[0], days + 1), dtype=np.int8)
+        np.add.at(diff, (room_rows, np.clip(starts, 0, days)), 1)
+        np.add.at(diff, (room_rows, np.clip(ends, 0, days)), -1)
+        occupied = np.cumsum(diff[:, :days], axis=1, dtype=np.int8).view(np.uint8)
+        np.bitwise_or(matrix, occupied * np.uint8(flag), out=matrix)
+
+    def apply(self, changes: Iterable[StayChange]) -> None:
+        with self._lock:
+            for change in changes:
+                for pending in self._pending:
+                    pending.append(change)
+                if self.origin is not None:
+                    if change.room_id not in self.rows:
+                        self.stale = True
+                        continue
+                    self._apply_one(self.matrix, self.rows, self.origin, change)
+
+    @staticmethod
+    def _apply_one(matrix: np.ndarray, rows: dict, origin: date, change: StayChange) -> None:
+        row = rows.get(change.room_id)
+        if row is None:
+            return
+        first = max(0, (change.start_date - origin).days)
+        last = min(matrix.shape[1], (change.end_date - origin).days)
+        if first >= last:
+            return
+        if change.added:
+            matrix[row, first:last] |= change.flag
+        else:
+            matrix[row, first:last] &= ~np.uint8(change.flag)
+
+    def snapshot(self, date_from: date, date_to: date, category: Optional[RoomCategory]) -> OccupancySnapshot:
+        """Booked/rented flags for nights date_from..date_to (inclusive) as boolean arrays."""
+        with self._lock:
+            first = (date_from - self.origin).days
+            last = (date_to - self.origin).days + 1
+            categories = self.categories
+            window = self.matrix[:, first:last]
+            if category is not None:
+                selected = categories == CATEGORIES.index(category)
+                categories, window = categories[selected], window[selected]
+            return OccupancySnapshot(self.origin, categories, (window & BOOKED) != 0, (window & RENTED) != 0)
+
+    def covers(self, date_from: date, date_to: date) -> bool:
+        return self.origin is not None and self.origin <= date_from and date_to < self.origin + timedelta(days=self.horizon)
+
+
+occupancy_calendar = OccupancyCalendar(settings.occupancy_horizon_days)
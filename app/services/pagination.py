@@ -0,0 +1,36 @@
+import base64
+import json
+from typing import Any, List, Optional
+
+from fastapi import HTTPException, Response, status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+
+
+def encode_cursor(key: int) -> str:
+    raw = json.dumps({"k": key}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        key = json.loads(base64.urlsafe_b64decode(padded))["k"]
+        if not isinstance(key, int):
+            raise ValueError(cursor)
+        return key
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def set_next_cursor(response: Response, items: List[Any], key: str, limit: Optional[int]) -> None:
+    """Expose the keyset cursor of the page's last row when the page is full."""
+    if limit is not None and items and len(items) == limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            last[key] if isinstance(last, dict) else getattr(last, key)
+        )
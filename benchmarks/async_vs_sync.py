@@ -0,0 +1,111 @@
+"""
+Sync vs async data path benchmark.
+
+Starts the API under uvicorn once per mode (ASYNC_MODE=false / true) against the
+same database, hammers a mix of read endpoints with concurrent clients and
+prints requests/sec and latency percentiles for each mode.
+
+    python -m benchmarks.async_vs_sync --concurrency 200 --duration 20
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+PATHS = ["/rooms/", "/rooms/free", "/bookings/", "/rentals/", "/statistics/"]
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    raise RuntimeError(f"Server at {base_url} did not become ready")
+
+
+async def drive(base_url: str, concurrency: int, duration: float):
+    latencies, errors = [], 0
+    stop_at = time.monotonic() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def worker(offset: int):
+            nonlocal errors
+            i = offset
+            while time.monotonic() < stop_at:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(PATHS[i % len(PATHS)])
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+                i += 1
+
+        await asyncio.gather(*(worker(n) for n in range(concurrency)))
+
+    return latencies, errors
+
+
+def run_mode(async_mode: bool, args) -> dict:
+    env = dict(os.environ, ASYNC_MODE=str(async_mode).lower())
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app",
+         "--port", str(args.port), "--workers", str(args.workers), "--log-level", "warning"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{args.port}"
+    try:
+        asyncio.run(wait_until_ready(base_url))
+        latencies, errors = asyncio.run(drive(base_url, args.concurrency, args.duration))
+    finally:
+        server.terminate()
+        server.wait()
+
+    return {
+        "mode": "async" if async_mode else "sync",
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / args.duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = [run_mode(False, args), run_mode(True, args)]
+
+    print(f"{'mode':<6} {'requests':>9} {'errors':>7} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        print(f"{r['mode']:<6} {r['requests']:>9} {r['errors']:>7} {r['rps']:>9.1f} "
+              f"{r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Concurrency check for POST /bookings/auto (FOR UPDATE SKIP LOCKED room assignment).
+
+For each client count, provisions a fresh block of rooms in one category, fires
+that many concurrent auto-bookings for the same stay, then verifies that no room
+was assigned twice and reports throughput. Run against a server backed by
+Postgres (SQLite has no row locks):
+
+    python -m benchmarks.auto_assign --base-url http://localhost:8000 --clients 1 8 32 64
+"""
+import argparse
+import asyncio
+import random
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+import httpx
+
+
+async def run_round(client: httpx.AsyncClient, clients: int, room_base: int, category: str) -> dict:
+    rooms = [{"number": room_base + i, "category": category} for i in range(clients)]
+    response = await client.post("/rooms/bulk", json=rooms)
+    response.raise_for_status()
+
+    start = date.today() + timedelta(days=random.randint(30, 300))
+    payload = {
+        "category": category,
+        "guest_name": "Load Test",
+        "start_date": start.isoformat(),
+        "end_date": (start + timedelta(days=2)).isoformat(),
+    }
+
+    async def book():
+        return await client.post("/bookings/auto", json=payload)
+
+    started = time.perf_counter()
+    responses = await asyncio.gather(*(book() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+
+    assigned = [r.json()["room_number"] for r in responses if r.status_code == 201]
+    block = {room["number"] for room in rooms}
+    doubles = [number for number, count in Counter(assigned).items() if count > 1]
+    return {
+        "clients": clients,
+        "booked": len(assigned),
+        "rejected": sum(r.status_code == 409 for r in responses),
+        "errors": sum(r.status_code not in (201, 409) for r in responses),
+        "outside_block": sum(number not in block for number in assigned),
+        "double_assigned": doubles,
+        "rps": clients / elapsed,
+    }
+
+
+async def main_async(args):
+    limits = httpx.Limits(max_connections=max(args.clients))
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=60.0) as client:
+        room_base = args.room_base
+        results = []
+        for clients in args.clients:
+            results.append(await run_round(client, clients, room_base, args.category))
+            room_base += clients
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 8, 32, 64])
+    parser.add_argument("--category", default="стандарт")
+    parser.add_argument("--room-base", type=int, default=900000)
+    args = parser.parse_args()
+
+    results = asyncio.run(main_async(args))
+    print(f"{'clients':>7} {'booked':>7} {'409':>5} {'errors':>6} {'req/s':>8}  double-assigned")
+    failed = False
+    for r in results:
+        failed |= bool(r["double_assigned"]) or r["errors"] > 0
+        print(f"{r['clients']:>7} {r['booked']:>7} {r['rejected']:>5} {r['errors']:>6} "
+              f"{r['rps']:>8.1f}  {r['double_assigned'] or '-'}")
+    raise SystemExit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""
+HTTP load driver for the hotel API.
+
+Runs a weighted mix of reads (/rooms/free, /bookings/, /rentals/, /statistics/)
+and writes (auto booking + cancellation, auto rental + completion) with a fixed
+number of concurrent virtual users, then reports throughput, latency percentiles
+and error rate per endpoint. Targets a running server (e.g. docker-compose) or,
+with --in-process, app.main:app directly over ASGI. Seed data first with
+benchmarks.datagen.
+
+    python -m benchmarks.loadtest --base-url http://localhost:8000 --concurrency 64 --duration 60
+    DATABASE_URL=sqlite:////tmp/hotel.db python -m benchmarks.loadtest --in-process --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+
+import httpx
+
+CATEGORIES = ["стандарт", "комфорт", "люкс", "президентський"]
+
+DEFAULT_MIX = {
+    "rooms_free": 40,
+    "rooms_available": 10,
+    "bookings_page": 10,
+    "rentals_page": 5,
+    "statistics": 20,
+    "book_and_cancel": 10,
+    "rent_and_complete": 5,
+}
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    index = min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))
+    return values[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    async def call(self, name, request, expected=(200, 201)):
+        started = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError:
+            self.errors[name] += 1
+            self.latencies[name].append(time.perf_counter() - started)
+            return None
+        self.latencies[name].append(time.perf_counter() - started)
+        if response.status_code not in expected:
+            self.errors[name] += 1
+        return response
+
+
+def random_stay(rng):
+    start = date.today() + timedelta(days=rng.randint(1, 365))
+    return start, start + timedelta(days=rng.randint(1, 7))
+
+
+async def rooms_free(client, rec, rng):
+    await rec.call("GET /rooms/free", client.get("/rooms/free", params={"category": rng.choice(CATEGORIES)}))
+
+
+async def rooms_available(client, rec, rng):
+    start, end = random_stay(rng)
+    await rec.call("GET /rooms/available", client.get("/rooms/available", params={
+        "start": start.isoformat(), "end": end.isoformat(), "category": rng.choice(CATEGORIES)
+    }))
+
+
+async def bookings_page(client, rec, rng):
+    await rec.call("GET /bookings/", client.get("/bookings/", params={"limit": 100}))
+
+
+async def rentals_page(client, rec, rng):
+    await rec.call("GET /rentals/", client.get("/rentals/", params={"limit": 100}))
+
+
+async def statistics(client, rec, rng):
+    await rec.call("GET /statistics/", client.get("/statistics/"))
+
+
+async def book_and_cancel(client, rec, rng):
+    start, end = random_stay(rng)
+    payload = {"category": rng.choice(CATEGORIES), "guest_name": "Load Test",
+               "start_date": start.isoformat(), "end_date": end.isoformat()}
+    # 409 = no free room in that category for the stay: a valid business outcome
+    response = await rec.call("POST /bookings/auto", client.post("/bookings/auto", json=payload), (201, 409))
+    if response is not None and response.status_code == 201:
+        await rec.call("DELETE /bookings/{id}", client.delete(f"/bookings/{response.json()['id']}"))
+
+
+async def rent_and_complete(client, rec, rng):
+    start = date.today()
+    payload = {"category": rng.choice(CATEGORIES), "guest_name": "Load Test",
+               "start_date": start.isoformat(), "end_date": (start + timedelta(days=1)).isoformat()}
+    response = await rec.call("POST /rentals/auto", client.post("/rentals/auto", json=payload), (201, 409))
+    if response is not None and response.status_code == 201:
+        await rec.call("PUT /rentals/{id}/complete", client.put(f"/rentals/{response.json()['id']}/complete"))
+
+
+SCENARIOS = {
+    "rooms_free": rooms_free,
+    "rooms_available": rooms_available,
+    "bookings_page": bookings_page,
+    "rentals_page": rentals_page,
+    "statistics": statistics,
+    "book_and_cancel": book_and_cancel,
+    "rent_and_complete": rent_and_complete,
+}
+
+
+def parse_mix(value):
+    mix = dict(DEFAULT_MIX)
+    if value:
+        for part in value.split(","):
+            name, _, weight = part.partition("=")
+            if name not in SCENARIOS:
+                raise SystemExit(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+            mix[name] = float(weight)
+    return [name for name in mix if mix[name] > 0], [w for w in mix.values() if w > 0]
+
+
+async def run(args):
+    names, weights = parse_mix(args.mix)
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    if args.in_process:
+        from app.main import app
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://testserver"
+    else:
+        transport = None
+        base_url = args.base_url
+
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, limits=limits, timeout=args.timeout) as client:
+        stop_at = time.monotonic() + args.duration
+
+        async def user(user_id):
+            rng = random.Random(args.seed + user_id)
+            while time.monotonic() < stop_at:
+                await SCENARIOS[rng.choices(names, weights)[0]](client, recorder, rng)
+
+        started = time.monotonic()
+        await asyncio.gather(*(user(n) for n in range(args.concurrency)))
+        elapsed = time.monotonic() - started
+
+    return recorder, elapsed
+
+
+def report(recorder, elapsed, as_json):
+    rows = []
+    for name in sorted(recorder.latencies):
+        values = sorted(recorder.latencies[name])
+        rows.append({
+            "endpoint": name,
+            "requests": len(values),
+            "rps": len(values) / elapsed,
+            "error_rate": recorder.errors[name] / len(values),
+            "p50_ms": percentile(values, 50) * 1000,
+            "p95_ms": percentile(values, 95) * 1000,
+            "p99_ms": percentile(values, 99) * 1000,
+        })
+
+    if as_json:
+        print(json.dumps({"elapsed_s": elapsed, "endpoints": rows}, indent=2))
+        return
+
+    print(f"{'endpoint':<28} {'requests':>9} {'req/s':>8} {'errors':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for r in rows:
+        print(f"{r['endpoint']:<28} {r['requests']:>9} {r['rps']:>8.1f} {r['error_rate']:>6.1%} "
+              f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+    total = sum(r["requests"] for r in rows)
+    print(f"\n{total} requests in {elapsed:.1f}s = {total / elapsed:.1f} req/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--in-process", action="store_true", help="Drive app.main:app over ASGI, no server needed")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--mix", help="Override scenario weights, e.g. statistics=50,book_and_cancel=0")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args()
+
+    recorder, elapsed = asyncio.run(run(args))
+    report(recorder, elapsed, args.json)
+
+
+if __name__ == "__main__":
+    main()
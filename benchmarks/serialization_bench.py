@@ -0,0 +1,62 @@
+"""
+Response serialization benchmark: default path vs FAST_RESPONSES.
+
+Seeds rooms, bookings and rentals, then times the list endpoints in-process with
+the standard path (ORM objects -> Pydantic models -> response_model validation ->
+JSON encoder) and the fast path (SQL rows -> dicts -> orjson). It also checks that
+both paths produce identical JSON.
+
+    python -m benchmarks.serialization_bench --rows 10000 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+PATHS = ["/rooms/", "/rooms/free", "/bookings/", "/rentals/"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url")
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'serialization.db')}"
+    os.environ["DATABASE_URL"] = database_url
+    # measure serialization, not cache hits
+    os.environ["ROOM_CACHE_ENABLED"] = "false"
+    os.environ["METRICS_ENABLED"] = "false"
+
+    from fastapi.testclient import TestClient
+    from benchmarks.service_bench import seed
+    from app.config import get_settings
+    from app.database.database import engine
+    from app.main import app
+
+    print(f"Seeding {args.rows} rooms...", file=sys.stderr)
+    seed(engine, args.rows)
+    settings = get_settings()
+    client = TestClient(app)
+
+    print(f"{'endpoint':<14} {'items':>6} {'default ms':>11} {'fast ms':>9} {'speedup':>8}  same JSON")
+    for path in PATHS:
+        timings, bodies = {}, {}
+        for fast in (False, True):
+            settings.fast_responses = fast
+            samples = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                response = client.get(path)
+                samples.append(time.perf_counter() - started)
+            timings[fast] = statistics.median(samples) * 1000
+            bodies[fast] = response.json()
+        print(f"{path:<14} {len(bodies[True]):>6} {timings[False]:>11.2f} {timings[True]:>9.2f} "
+              f"{timings[False] / timings[True]:>7.1f}x  {bodies[False] == bodies[True]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+HotelService microbenchmarks.
+
+Seeds a database with datasets of increasing size and times every HotelService
+operation against each one, recording per-operation latency, SQL statement count
+and Python allocations. Results are written as JSON; --compare flags regressions
+between two result files.
+
+    python -m benchmarks.service_bench --sizes 100 10000 --output bench.json
+    python -m benchmarks.service_bench --database-url postgresql://... --sizes 1000000
+    python -m benchmarks.service_bench --compare base.json bench.json --threshold 1.25
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta, timezone
+from itertools import count
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--database-url", help="Throwaway database (default: temporary SQLite file)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--full-scan-max", type=int, default=100000,
+                        help="Skip unpaginated list/export operations above this many rooms")
+    parser.add_argument("--output", default="bench.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"))
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Flag operations whose median latency grew by more than this factor")
+    return parser.parse_args()
+
+
+def configure_environment(database_url: str):
+    # Settings are read at import time, so the environment must be in place first.
+    os.environ["DATABASE_URL"] = database_url
+    os.environ["ROOM_CACHE_ENABLED"] = "false"
+    os.environ.setdefault("STATISTICS_COUNTERS", "false")
+
+
+def seed(engine, size: int):
+    from sqlalchemy import insert
+    from app.database.database import Base
+    from app.models.booking import Booking
+    from app.models.enums import ReservationState, RoomCategory, RoomStatus
+    from app.models.rental import Rental
+    from app.models.room import Room
+    from app.models import room_counter, reservation_history, idempotency_key  # noqa: F401 - register tables
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    categories = list(RoomCategory)
+    chunk = 5000
+    start = date.today() + timedelta(days=400)
+    with engine.begin() as conn:
+        for offset in range(0, size, chunk):
+            numbers = range(offset + 1, min(size, offset + chunk) + 1)
+            conn.execute(insert(Room), [
+                {
+                    "number": n,
+                    "category": categories[n % len(categories)],
+                    # every other room booked, every fourth rented
+                    "status": RoomStatus.RENTED if n % 4 == 0 else RoomStatus.BOOKED if n % 2 == 0 else RoomStatus.FREE,
+                }
+                for n in numbers
+            ])
+            # Core inserts bypass the ORM, so the polymorphic state is set explicitly
+            conn.execute(insert(Booking), [
+                {"room_id": n, "state": ReservationState.BOOKED, "guest_name": f"Guest {n}", "start_date": start, "end_date": start + timedelta(days=3)}
+                for n in numbers if n % 2 == 0 and n % 4 != 0
+            ])
+            conn.execute(insert(Rental), [
+                {"room_id": n, "state": ReservationState.RENTED, "guest_name": f"Guest {n}", "start_date": start, "end_date": start + timedelta(days=3)}
+                for n in numbers if n % 4 == 0
+            ])
+
+
+def build_operations(size: int, full_scans: bool):
+    """(name, callable(service, i)) pairs; `i` gives each repetition fresh inputs."""
+    from app.models.enums import ExportFormat, RoomCategory
+    from app.models.schemas import (
+        AutoBookingCreate, AutoRentalCreate, BookingCreate, GroupBookingCreate, RentalCreate, RoomCreate
+    )
+    from app.services.occupancy import occupancy_calendar
+
+    new_numbers = count(size + 1)
+    stay = date.today() + timedelta(days=30)
+    booking_ids, rental_ids = [], []
+
+    def stay_for(i):
+        first = stay + timedelta(days=3 * i)
+        return first, first + timedelta(days=2)
+
+    def create_booking(service, i):
+        start, end = stay_for(i)
+        booking = service.create_booking(BookingCreate(
+            room_number=1 + 2 * (i % max(1, size // 2)), guest_name="Bench", start_date=start, end_date=end
+        ))
+        booking_ids.append(booking.id)
+
+    def create_rental(service, i):
+        start, end = stay_for(i)
+        rental = service.create_rental(RentalCreate(
+            room_number=3 + 2 * (i % max(1, size // 2 - 1)), guest_name="Bench", start_date=start, end_date=end
+        ))
+        rental_ids.append(rental.id)
+
+    def auto_booking(service, i):
+        start, end = stay_for(i)
+        booking = service.create_auto_booking(AutoBookingCreate(
+            category=RoomCategory.LUX, guest_name="Bench", start_date=start, end_date=end
+        ))
+        booking_ids.append(booking.id)
+
+    def auto_rental(service, i):
+        start, end = stay_for(i)
+        rental = service.create_auto_rental(AutoRentalCreate(
+            category=RoomCategory.COMFORT, guest_name="Bench", start_date=start, end_date=end
+        ))
+        rental_ids.append(rental.id)
+
+    def group_booking(service, i):
+        start, end = stay_for(1000 + i)
+        group = service.create_group_booking(GroupBookingCreate(
+            room_numbers=[1 + 2 * ((i * 10 + k) % max(1, size // 2)) for k in range(10)],
+            guest_name="Bench Group", start_date=start, end_date=end
+        ))
+        booking_ids.extend(booking.id for booking in group.bookings)
+
+    def drain(iterator):
+        for _ in iterator:
+            pass
+
+    operations = [
+        ("create_room", lambda s, i: s.create_room(RoomCreate(number=next(new_numbers), category=RoomCategory.STANDARD))),
+        ("create_rooms_bulk_100", lambda s, i: s.create_rooms_bulk(
+            [RoomCreate(number=next(new_numbers), category=RoomCategory.COMFORT) for _ in range(100)]
+        )),
+        ("get_room_by_number", lambda s, i: s.get_room_by_number(1 + (i * 7919) % size)),
+        ("get_all_rooms_page_100", lambda s, i: s.get_all_rooms(limit=100)),
+        ("get_free_rooms_lux", lambda s, i: s.get_free_rooms(category=RoomCategory.LUX)),
+        ("get_available_rooms", lambda s, i: s.get_available_rooms(*stay_for(i), category=RoomCategory.LUX)),
+        ("create_booking", create_booking),
+        ("create_auto_booking", auto_booking),
+        ("create_group_booking_10", group_booking),
+        ("get_all_bookings_page_100", lambda s, i: s.get_all_bookings(limit=100)),
+        ("delete_booking", lambda s, i: s.delete_booking(booking_ids.pop())),
+        ("check_in_booking", lambda s, i: rental_ids.append(s.check_in_booking(booking_ids.pop()).id)),
+        ("create_rental", create_rental),
+        ("create_auto_rental", auto_rental),
+        ("get_all_rentals_page_100", lambda s, i: s.get_all_rentals(limit=100)),
+        ("complete_rental", lambda s, i: s.complete_rental(rental_ids.pop())),
+        ("get_statistics", lambda s, i: s.get_statistics()),
+        ("occupancy_build", lambda s, i: occupancy_calendar.build(s.db)),
+        ("get_occupancy_year", lambda s, i: s.get_occupancy(date.today(), date.today() + timedelta(days=365))),
+    ]
+    if full_scans:
+        operations += [
+            ("get_all_rooms", lambda s, i: s.get_all_rooms()),
+            ("get_all_bookings", lambda s, i: s.get_all_bookings()),
+            ("get_all_rentals", lambda s, i: s.get_all_rentals()),
+            ("export_bookings_ndjson", lambda s, i: drain(s.export_bookings(ExportFormat.NDJSON))),
+            ("export_rentals_csv", lambda s, i: drain(s.export_rentals(ExportFormat.CSV))),
+        ]
+    return operations
+
+
+def measure(operation, repeat: int, statements: list) -> dict:
+    from app.database.database import SessionLocal
+    from app.services.hotel_service import HotelService
+
+    latencies, statement_counts = [], []
+    for i in range(repeat):
+        db = SessionLocal()
+        try:
+            service = HotelService(db)
+            statements.clear()
+            started = time.perf_counter()
+            operation(service, i)
+            latencies.append(time.perf_counter() - started)
+            statement_counts.append(len(statements))
+        finally:
+            db.close()
+
+    # Allocations are traced in a separate run: tracemalloc would distort the timings.
+    db = SessionLocal()
+    try:
+        tracemalloc.start()
+        operation(HotelService(db), repeat)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        db.close()
+
+    latencies.sort()
+    return {
+        "median_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[min(len(latencies) - 1, int(0.95 * len(latencies)))] * 1000,
+        "min_ms": latencies[0] * 1000,
+        "statements": max(statement_counts),
+        "peak_alloc_kb": peak / 1024,
+    }
+
+
+def run(args):
+    from sqlalchemy import event
+    from app.database.database import engine
+
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+
+    results = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "repeat": args.repeat,
+        },
+        "results": {},
+    }
+    for size in args.sizes:
+        print(f"Seeding {size} rooms...", file=sys.stderr)
+        seed(engine, size)
+        per_size = results["results"][str(size)] = {}
+        for name, operation in build_operations(size, size <= args.full_scan_max):
+            per_size[name] = measure(operation, args.repeat, statements)
+            r = per_size[name]
+            print(f"{size:>8} {name:<28} {r['median_ms']:>9.3f} ms  p95 {r['p95_ms']:>9.3f} ms  "
+                  f"{r['statements']:>3} stmts  {r['peak_alloc_kb']:>9.1f} KiB", file=sys.stderr)
+    return results
+
+
+def compare(baseline_path: str, current_path: str, threshold: float) -> int:
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    with open(current_path) as f:
+        current = json.load(f)["results"]
+
+    regressions = 0
+    print(f"{'size':>8} {'operation':<28} {'base ms':>9} {'now ms':>9} {'ratio':>6} {'stmts':>9}")
+    for size, operations in current.items():
+        for name, now in operations.items():
+            base = baseline.get(size, {}).get(name)
+            if base is None:
+                continue
+            ratio = now["median_ms"] / base["median_ms"] if base["median_ms"] else float("inf")
+            more_sql = now["statements"] > base["statements"]
+            flag = ratio > threshold or more_sql
+            regressions += flag
+            print(f"{size:>8} {name:<28} {base['median_ms']:>9.3f} {now['median_ms']:>9.3f} {ratio:>6.2f} "
+                  f"{base['statements']:>4}->{now['statements']:<4}{'  REGRESSION' if flag else ''}")
+    print(f"\n{regressions} regression(s) at threshold {threshold}x")
+    return 1 if regressions else 0
+
+
+def main():
+    args = parse_args()
+    if args.compare:
+        raise SystemExit(compare(*args.compare, args.threshold))
+
+    database_url = args.database_url
+    if database_url is None:
+        database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    configure_environment(database_url)
+
+    results = run(args)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {args.output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
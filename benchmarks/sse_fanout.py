@@ -0,0 +1,86 @@
+"""
+Live room feed fan-out benchmark.
+
+Subscribes N in-process clients to the room event broker (a mix of category
+filters), publishes deltas from a worker thread the way commits do, and reports
+how long it takes until every client has its message.
+
+    python -m benchmarks.sse_fanout --clients 5000 --events 200
+"""
+import argparse
+import asyncio
+import threading
+import time
+from contextlib import ExitStack
+
+from app.models.enums import RoomCategory
+from app.services import events as room_events_module
+from app.services.events import RoomEventBroker
+
+
+async def run(clients: int, events: int) -> float:
+    # The whole burst must fit into each client's queue, otherwise it is collapsed into a resync
+    room_events_module.SUBSCRIBER_QUEUE_SIZE = max(room_events_module.SUBSCRIBER_QUEUE_SIZE, events)
+    broker = RoomEventBroker()
+    broker.start(asyncio.get_running_loop())
+    filters = [None, *RoomCategory]
+    categories = list(RoomCategory)
+
+    with ExitStack() as stack:
+        subscribers = [
+            stack.enter_context(broker.subscribe(filters[index % len(filters)]))
+            for index in range(clients)
+        ]
+
+        # "All" subscribers get every event, filtered ones every len(categories)-th
+        expected = sum(
+            events if subscriber.category is None else events // len(categories)
+            + (categories.index(subscriber.category) < events % len(categories))
+            for subscriber in subscribers
+        )
+        delivered = 0
+        done = asyncio.Event()
+
+        async def drain(subscriber):
+            nonlocal delivered
+            while True:
+                await subscriber.queue.get()
+                delivered += 1
+                if delivered == expected:
+                    done.set()
+
+        drainers = [asyncio.create_task(drain(subscriber)) for subscriber in subscribers]
+        await asyncio.sleep(0)
+
+        def publish():
+            for index in range(events):
+                category = categories[index % len(categories)]
+                broker.publish([{"number": index, "category": category.value,
+                                 "status": "заброньований", "previous_status": "вільний"}])
+
+        started = time.perf_counter()
+        thread = threading.Thread(target=publish)
+        thread.start()
+        await done.wait()
+        thread.join()
+        elapsed = time.perf_counter() - started
+
+        for drainer in drainers:
+            drainer.cancel()
+        await asyncio.gather(*drainers, return_exceptions=True)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--events", type=int, default=100)
+    args = parser.parse_args()
+
+    elapsed = asyncio.run(run(args.clients, args.events))
+    print(f"{args.events} events to {args.clients} clients in {elapsed * 1000:.1f} ms "
+          f"({args.events / elapsed:.0f} events/s, {elapsed / args.events * 1e6:.0f} us per event)")
+
+
+if __name__ == "__main__":
+    main()
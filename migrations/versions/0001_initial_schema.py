@@ -0,0 +1,100 @@
+"""initial schema: rooms, bookings, rentals, room_counters
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+Databases created earlier by Base.metadata.create_all may already have some of
+these tables, without the newer ones (room_counters) or indexes (room_dates, GiST).
+Only what is missing is created, so such databases are upgraded like empty ones.
+"""
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+ROOM_CATEGORY = ("STANDARD", "COMFORT", "LUX", "PRESIDENT")
+ROOM_STATUS = ("FREE", "BOOKED", "RENTED")
+
+
+def enum_type(values, name, create_type=True):
+    # Postgres keeps enums as named types, created once and reused by room_counters
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=create_type), "postgresql"
+    )
+
+
+class ExistingSchema:
+    """Tables and indexes already in the database (none when generating offline SQL)."""
+
+    def __init__(self):
+        self.tables, self.indexes = set(), set()
+        if not context.is_offline_mode():
+            inspector = sa.inspect(op.get_bind())
+            self.tables = set(inspector.get_table_names())
+            self.indexes = {index["name"] for table in self.tables for index in inspector.get_indexes(table)}
+
+    def create_table(self, name: str, *columns) -> None:
+        if name not in self.tables:
+            op.create_table(name, *columns)
+
+    def create_index(self, name: str, table: str, columns, **kwargs) -> None:
+        if name not in self.indexes:
+            op.create_index(name, table, columns, **kwargs)
+
+
+def create_reservation_table(schema: ExistingSchema, name: str) -> None:
+    schema.create_table(
+        name,
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("room_id", sa.Integer(), sa.ForeignKey("rooms.id"), nullable=False),
+        sa.Column("guest_name", sa.String(length=255), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+    )
+    schema.create_index(f"ix_{name}_id", name, ["id"])
+    schema.create_index(f"ix_{name}_room_dates", name, ["room_id", "start_date", "end_date"])
+    if op.get_context().dialect.name == "postgresql":
+        schema.create_index(
+            f"ix_{name}_stay_gist",
+            name,
+            [sa.text("daterange(start_date, end_date)")],
+            postgresql_using="gist",
+        )
+
+
+def upgrade() -> None:
+    schema = ExistingSchema()
+    schema.create_table(
+        "rooms",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("number", sa.Integer(), nullable=False),
+        sa.Column("category", enum_type(ROOM_CATEGORY, "roomcategory"), nullable=False),
+        sa.Column("status", enum_type(ROOM_STATUS, "roomstatus"), nullable=False),
+    )
+    schema.create_index("ix_rooms_id", "rooms", ["id"])
+    schema.create_index("ix_rooms_number", "rooms", ["number"], unique=True)
+
+    create_reservation_table(schema, "bookings")
+    create_reservation_table(schema, "rentals")
+
+    schema.create_table(
+        "room_counters",
+        sa.Column("category", enum_type(ROOM_CATEGORY, "roomcategory", create_type=False), primary_key=True),
+        sa.Column("status", enum_type(ROOM_STATUS, "roomstatus", create_type=False), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("room_counters")
+    op.drop_table("rentals")
+    op.drop_table("bookings")
+    op.drop_table("rooms")
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS roomstatus")
+        op.execute("DROP TYPE IF EXISTS roomcategory")
@@ -0,0 +1,71 @@
+"""reservation history archive and daily revenue rollups
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+ROOM_CATEGORY = ("STANDARD", "COMFORT", "LUX", "PRESIDENT")
+RESERVATION_KIND = ("BOOKING", "RENTAL")
+RESERVATION_OUTCOME = ("COMPLETED", "CANCELLED")
+
+# Yearly partitions of reservation_history by end_date; anything outside lands in the
+# default partition until a migration adds the missing years.
+HISTORY_YEARS = range(2020, 2036)
+
+
+def enum_type(values, name, create_type=True):
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=create_type), "postgresql"
+    )
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_context().dialect.name == "postgresql"
+
+    op.create_table(
+        "reservation_history",
+        sa.Column("kind", enum_type(RESERVATION_KIND, "reservationkind"), primary_key=True),
+        sa.Column("reservation_id", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("end_date", sa.Date(), primary_key=True),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("outcome", enum_type(RESERVATION_OUTCOME, "reservationoutcome"), nullable=False),
+        sa.Column("room_number", sa.Integer(), nullable=False),
+        sa.Column("category", enum_type(ROOM_CATEGORY, "roomcategory", create_type=False), nullable=False),
+        sa.Column("guest_name", sa.String(length=255), nullable=False),
+        sa.Column("total_cost", sa.Float(), nullable=False),
+        sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        postgresql_partition_by="RANGE (end_date)",
+    )
+    if is_postgresql:
+        for year in HISTORY_YEARS:
+            op.execute(
+                f"CREATE TABLE reservation_history_{year} PARTITION OF reservation_history "
+                f"FOR VALUES FROM ('{year}-01-01') TO ('{year + 1}-01-01')"
+            )
+        op.execute("CREATE TABLE reservation_history_default PARTITION OF reservation_history DEFAULT")
+
+    op.create_table(
+        "daily_revenue",
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("category", enum_type(ROOM_CATEGORY, "roomcategory", create_type=False), primary_key=True),
+        sa.Column("revenue", sa.Float(), nullable=False),
+        sa.Column("room_nights", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_revenue")
+    # Dropping a partitioned table drops its partitions
+    op.drop_table("reservation_history")
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS reservationoutcome")
+        op.execute("DROP TYPE IF EXISTS reservationkind")
@@ -0,0 +1,47 @@
+"""room indexes for status/category listings, auto-assign and free rooms
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+FREE_ONLY = sa.text("status = 'FREE'")
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_context().dialect.name == "postgresql"
+    # Postgres: build without blocking writes to rooms; CONCURRENTLY cannot run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_rooms_category_status_number",
+            "rooms",
+            ["category", "status", "number"],
+            postgresql_concurrently=is_postgresql,
+        )
+        op.create_index(
+            "ix_rooms_category_id",
+            "rooms",
+            ["category", "id"],
+            postgresql_concurrently=is_postgresql,
+        )
+        op.create_index(
+            "ix_rooms_free_category_number",
+            "rooms",
+            ["category", "number"],
+            postgresql_where=FREE_ONLY,
+            sqlite_where=FREE_ONLY,
+            postgresql_concurrently=is_postgresql,
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rooms_free_category_number", table_name="rooms")
+    op.drop_index("ix_rooms_category_id", table_name="rooms")
+    op.drop_index("ix_rooms_category_status_number", table_name="rooms")
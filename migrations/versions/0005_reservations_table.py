@@ -0,0 +1,127 @@
+"""merge bookings and rentals into reservations with a lifecycle state
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-17
+
+Bookings keep their ids. Rentals are renumbered to old id + N, where N is the
+highest id ever issued to a booking or rental (sequences and archived history
+included), since both now share one id sequence; N is logged by the upgrade.
+Archived history rows keep the old ids, and the new sequence starts past all of them.
+"""
+import logging
+
+from alembic import context, op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+RESERVATION_STATE = ("BOOKED", "RENTED")
+
+# (old table, state of its rows)
+STATE_TABLES = (("bookings", "BOOKED"), ("rentals", "RENTED"))
+
+COLUMNS = "room_id, guest_name, start_date, end_date"
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+
+def enum_type(values, name, create_type=True):
+    return sa.Enum(*values, name=name).with_variant(
+        postgresql.ENUM(*values, name=name, create_type=create_type), "postgresql"
+    )
+
+
+def create_stay_indexes(name: str) -> None:
+    op.create_index(f"ix_{name}_id", name, ["id"])
+    op.create_index(f"ix_{name}_room_dates", name, ["room_id", "start_date", "end_date"])
+    if op.get_context().dialect.name == "postgresql":
+        op.create_index(
+            f"ix_{name}_stay_gist",
+            name,
+            [sa.text("daterange(start_date, end_date)")],
+            postgresql_using="gist",
+        )
+
+
+def create_stay_table(name: str, extra_columns=()) -> None:
+    op.create_table(
+        name,
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("room_id", sa.Integer(), sa.ForeignKey("rooms.id"), nullable=False),
+        *extra_columns,
+        sa.Column("guest_name", sa.String(length=255), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("end_date", sa.Date(), nullable=False),
+    )
+    create_stay_indexes(name)
+
+
+def greatest(*values: str) -> str:
+    function = "GREATEST" if op.get_context().dialect.name == "postgresql" else "MAX"
+    return f"{function}({', '.join(values)})"
+
+
+def highest_issued_id() -> str:
+    """SQL for the highest id the old bookings/rentals tables ever handed out."""
+    values = [
+        "(SELECT COALESCE(MAX(id), 0) FROM bookings)",
+        "(SELECT COALESCE(MAX(id), 0) FROM rentals)",
+        "(SELECT COALESCE(MAX(reservation_id), 0) FROM reservation_history)",
+    ]
+    if op.get_context().dialect.name == "postgresql":
+        # Ids of deleted rows are gone from the tables but not from their sequences
+        values += ["(SELECT last_value FROM bookings_id_seq)", "(SELECT last_value FROM rentals_id_seq)"]
+    return greatest(*values)
+
+
+def reset_sequence(table: str, floor: str) -> None:
+    # explicit ids were inserted, move the sequence past them and past `floor`
+    if op.get_context().dialect.name == "postgresql":
+        op.execute(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"{greatest('COALESCE(MAX(id), 0)', floor)} + 1, false) FROM {table}"
+        )
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_context().dialect.name == "postgresql"
+    create_stay_table(
+        "reservations",
+        [sa.Column("state", enum_type(RESERVATION_STATE, "reservationstate"), nullable=False)],
+    )
+
+    floor = highest_issued_id()
+    if not context.is_offline_mode():
+        offset = op.get_bind().execute(sa.text(f"SELECT {floor}")).scalar()
+        logger.info("Rentals renumbered: new rental id = old rental id + %s", offset)
+
+    for table, state in STATE_TABLES:
+        state_value = f"'{state}'::reservationstate" if is_postgresql else f"'{state}'"
+        id_offset = f"{floor} + " if table == "rentals" else ""
+        op.execute(
+            f"INSERT INTO reservations (id, state, {COLUMNS}) "
+            f"SELECT {id_offset}id, {state_value}, {COLUMNS} FROM {table} ORDER BY id"
+        )
+    reset_sequence("reservations", floor)
+
+    op.drop_table("rentals")
+    op.drop_table("bookings")
+
+
+def downgrade() -> None:
+    for table, state in STATE_TABLES:
+        create_stay_table(table)
+        op.execute(
+            f"INSERT INTO {table} (id, {COLUMNS}) "
+            f"SELECT id, {COLUMNS} FROM reservations WHERE state = '{state}' ORDER BY id"
+        )
+        reset_sequence(table, "(SELECT COALESCE(MAX(id), 0) FROM reservations)")
+
+    op.drop_table("reservations")
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS reservationstate")
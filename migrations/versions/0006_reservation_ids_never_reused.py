@@ -0,0 +1,46 @@
+"""reservation ids are never reused
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-17
+
+reservation_history is keyed by (kind, reservation_id, end_date), so an id that is
+handed out again after its reservation was archived collides on the next archive.
+SQLite reuses a deleted max INTEGER PRIMARY KEY unless the table is AUTOINCREMENT;
+on both databases the id counter also has to start past every archived id.
+"""
+from alembic import op
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# Highest id ever issued that is still visible: live rows and archived ones
+HIGHEST_ID = (
+    "SELECT MAX(id) FROM ("
+    "SELECT COALESCE(MAX(id), 0) AS id FROM reservations "
+    "UNION ALL SELECT COALESCE(MAX(reservation_id), 0) FROM reservation_history"
+    ") AS ids"
+)
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.execute(
+            "SELECT setval(pg_get_serial_sequence('reservations', 'id'), "
+            f"GREATEST(({HIGHEST_ID}) + 1, nextval(pg_get_serial_sequence('reservations', 'id'))), false)"
+        )
+        return
+
+    # SQLite: rebuild the table with AUTOINCREMENT, then start its counter past the archive
+    with op.batch_alter_table("reservations", recreate="always", table_kwargs={"sqlite_autoincrement": True}):
+        pass
+    op.execute("DELETE FROM sqlite_sequence WHERE name = 'reservations'")
+    op.execute(f"INSERT INTO sqlite_sequence (name, seq) VALUES ('reservations', ({HIGHEST_ID}))")
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != "postgresql":
+        with op.batch_alter_table("reservations", recreate="always", table_kwargs={"sqlite_autoincrement": False}):
+            pass
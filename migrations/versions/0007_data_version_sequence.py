@@ -0,0 +1,27 @@
+"""shared data version sequence for ETags
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-17
+
+Every committed write draws the next value and sends it to the other workers,
+so all workers issue the same ETags. Postgres only; other databases keep
+per-process versions.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.execute(sa.schema.CreateSequence(sa.Sequence("data_version_seq")))
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.execute(sa.schema.DropSequence(sa.Sequence("data_version_seq")))
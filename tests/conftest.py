@@ -0,0 +1,76 @@
+import os
+import tempfile
+
+# Settings are read at import time, so the test database must be configured first.
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+os.environ["STATISTICS_COUNTERS"] = "false"
+
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+
+from app.database import database
+from app.database.database import Base, engine
+from app.main import app
+from app.models import idempotency_key, reservation_history, room_counter  # noqa: F401 - register tables
+from app.models.booking import Booking
+from app.models.enums import ReservationState, RoomCategory, RoomStatus
+from app.models.rental import Rental
+from app.models.room import Room
+
+
+def seed_reservations(size: int) -> None:
+    """Recreate the test database with `size` rooms, each with one booking and one later rental."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    if not size:
+        return
+    start = date.today() + timedelta(days=30)
+    with engine.begin() as conn:
+        conn.execute(insert(Room), [
+            {"number": n, "category": RoomCategory.STANDARD, "status": RoomStatus.BOOKED}
+            for n in range(1, size + 1)
+        ])
+        # Core inserts bypass the ORM, so the polymorphic state is set explicitly
+        conn.execute(insert(Booking), [
+            {"room_id": n, "state": ReservationState.BOOKED, "guest_name": f"Guest {n}",
+             "start_date": start, "end_date": start + timedelta(days=3)}
+            for n in range(1, size + 1)
+        ])
+        conn.execute(insert(Rental), [
+            {"room_id": n, "state": ReservationState.RENTED, "guest_name": f"Guest {n}",
+             "start_date": start + timedelta(days=10), "end_date": start + timedelta(days=12)}
+            for n in range(1, size + 1)
+        ])
+
+
+@pytest.fixture
+def seed():
+    return seed_reservations
+
+
+@pytest.fixture
+def client():
+    # No `with`: the lifespan (listeners, pool warm-up) is not needed for plain requests
+    return TestClient(app)
+
+
+@pytest.fixture
+def statements():
+    """SQL statements executed through the app's engine while the test runs."""
+    engines = [database.engine]
+    if database.async_engine is not None:
+        engines.append(database.async_engine.sync_engine)
+
+    recorded = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        recorded.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", record)
+    yield recorded
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", record)
@@ -0,0 +1,57 @@
+import json
+from datetime import date, timedelta
+
+from app.services.idempotency import idempotency, request_fingerprint, StoredResponse
+
+ROOM = {"number": 501, "category": "люкс"}
+
+
+def booking_body() -> dict:
+    start = date.today() + timedelta(days=60)
+    return {"room_number": ROOM["number"], "guest_name": "Retry", "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=2)).isoformat()}
+
+
+def orphan_claim(key: str, fingerprint: str, lease: int):
+    """Claim `key` as a worker that then dies mid-request would."""
+    store = idempotency.store
+    previous, store.lease = store.lease, lease
+    try:
+        lease_until, existing = store.claim(key, fingerprint)
+    finally:
+        store.lease = previous
+    assert existing is None
+    return lease_until
+
+
+def test_orphaned_claim_blocks_retries_only_for_its_lease(client, seed, monkeypatch):
+    seed(0)
+    idempotency.cache.clear()
+    monkeypatch.setattr(idempotency, "wait_seconds", 0.2)
+    assert client.post("/rooms/", json=ROOM).status_code == 201
+    body = booking_body()
+    fingerprint = request_fingerprint("POST", "/bookings/", json.dumps(body).encode())
+
+    def post(key: str):
+        return client.post("/bookings/", content=json.dumps(body),
+                           headers={"Idempotency-Key": key, "Content-Type": "application/json"})
+
+    orphan_claim("live-lease", fingerprint, lease=60)
+    assert post("live-lease").status_code == 409
+
+    orphan_claim("expired-lease", fingerprint, lease=-1)
+    assert post("expired-lease").status_code == 201
+    assert post("expired-lease").headers.get("Idempotent-Replayed") == "true"
+
+
+def test_late_completion_does_not_overwrite_a_takeover(seed):
+    seed(0)
+    store = idempotency.store
+    stale_lease = orphan_claim("taken-over", "fingerprint", lease=-1)
+    new_lease, existing = store.claim("taken-over", "fingerprint")
+    assert existing is None
+
+    store.complete("taken-over", stale_lease, StoredResponse("fingerprint", 201, {"late": True}))
+    assert store.load("taken-over").status_code is None
+    store.complete("taken-over", new_lease, StoredResponse("fingerprint", 201, {"id": 1}))
+    assert store.load("taken-over").body == {"id": 1}
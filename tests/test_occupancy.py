@@ -0,0 +1,45 @@
+"""
+Occupancy matrix builds under async mode: HotelService runs through AsyncSession.run_sync
+on the event loop thread, so concurrent builds must not wait on each other with a
+thread lock (the build holding it could never resume).
+"""
+import asyncio
+import threading
+from datetime import date, timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database.database import engine, to_async_url
+from app.services.async_hotel_service import AsyncHotelService
+from app.services.occupancy import occupancy_calendar
+
+SIZE = 50
+CONCURRENT = 8
+
+
+def test_concurrent_async_builds_do_not_hang(seed):
+    seed(SIZE)
+    async_engine = create_async_engine(to_async_url(engine.url.render_as_string(hide_password=False)))
+    first_night = date.today() + timedelta(days=40)
+
+    async def occupancy():
+        async with AsyncSession(async_engine) as session:
+            return await AsyncHotelService(session).get_occupancy(first_night, first_night + timedelta(days=1))
+
+    async def requests():
+        try:
+            occupancy_calendar.invalidate()
+            return await asyncio.gather(*(occupancy() for _ in range(CONCURRENT)))
+        finally:
+            await async_engine.dispose()
+
+    results = []
+    # A hung event loop cannot time itself out, so the loop runs in a thread we can abandon
+    loop_thread = threading.Thread(target=lambda: results.extend(asyncio.run(requests())), daemon=True)
+    loop_thread.start()
+    loop_thread.join(timeout=30)
+
+    assert not loop_thread.is_alive(), "concurrent occupancy builds hung the event loop"
+    assert len(results) == CONCURRENT
+    # Every room is rented for nights 40 and 41 of the seeded stays
+    assert all(result.rented_room_nights == 2 * SIZE for result in results)
@@ -0,0 +1,19 @@
+import pytest
+
+SIZE = 20
+
+
+def count_statements(client, statements, seed, path: str, size: int) -> int:
+    seed(size)
+    statements.clear()
+    response = client.get(path)
+    assert response.status_code == 200
+    assert len(response.json()) == size
+    return len(statements)
+
+
+@pytest.mark.parametrize("path", ["/bookings/", "/rentals/"])
+def test_list_statement_count_does_not_grow_with_rows(client, statements, seed, path):
+    small = count_statements(client, statements, seed, path, SIZE)
+    large = count_statements(client, statements, seed, path, SIZE * 10)
+    assert small == large, f"{path}: {small} statements for {SIZE} rows, {large} for {SIZE * 10}"
@@ -0,0 +1,25 @@
+from app.database.database import SessionLocal
+from app.services.cache import room_lists, rooms_changed
+from app.services.hotel_service import HotelService
+
+
+def test_fill_racing_with_a_write_is_not_stored(seed):
+    seed(3)
+    db = SessionLocal()
+    try:
+        service = HotelService(db)
+        room_lists.clear()
+
+        def load_then_write():
+            rooms = ["rows read before the write"]
+            # A write commits (and invalidates) after the query read its rows
+            rooms_changed()
+            return rooms
+
+        assert service._cached(room_lists, "key", load_then_write) == ["rows read before the write"]
+        assert room_lists.get("key") is None
+
+        free = service.get_free_rooms()
+        assert room_lists.get(("free", None, False)) == free
+    finally:
+        db.close()